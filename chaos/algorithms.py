@@ -4,8 +4,42 @@ This module provides various algorithms for calculating different types of entro
 """
 
 import numpy as np
-from math import log2
-from typing import Any, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from time import perf_counter
+from typing import Any, Optional, Sequence, Tuple, Union
+from .models import SampledEntropy, SweepResult
+from .jit import JIT_AVAILABLE, jit_unavailable_reason, supports_jit
+from .representations import (
+    BINARY_REPRESENTATIONS,
+    matches_by_key,
+    matching_pairs,
+    template_phi,
+)
+from .kernels import (
+    DEFAULT_MAX_PAIRS,
+    DEFAULT_SAMPLED_PAIRS,
+    DEFAULT_TILE_SIZE,
+    MATCHING_METHODS,
+    as_series,
+    batch_segments,
+    compiled_neighbor_counts,
+    dimension_neighbor_counts,
+    entropy_from_counts,
+    hashed_neighbor_counts,
+    neighbor_counts,
+    ordinal_patterns,
+    ordinal_pattern_counts,
+    rolling_entropy,
+    sampled_matches,
+    segment_entropy,
+    select_method,
+    self_matches,
+    series_std,
+    sorted_neighbor_counts,
+    sweep_neighbor_counts,
+    symbol_counts,
+)
 
 
 class Algorithms:
@@ -15,135 +49,554 @@ class Algorithms:
         """Initialize the entropy analysis toolkit."""
         pass
 
-    def shannon_entropy(self, data: Sequence[Any], base: int = 2) -> float:
+    def shannon_entropy(
+        self,
+        data: Sequence[Any],
+        base: int = 2,
+        axis: Optional[int] = None,
+        offsets: Optional[Sequence[int]] = None,
+    ) -> Union[float, np.ndarray]:
         """Calculate Shannon entropy of input data.
 
         Args:
-            data: Input sequence data to analyze
+            data: Input sequence data to analyze, a SparseOneHot or
+                PackedBits, or a batch of sequences when axis or offsets is
+                given
             base: Base for logarithm calculation, defaults to 2
+            axis: Axis along which the sequences of an array batch run
+            offsets: Boundaries of a ragged batch of concatenated sequences,
+                sequence k spans data[offsets[k]:offsets[k + 1]]
 
         Returns:
-            float: Calculated Shannon entropy value
+            Union[float, np.ndarray]: Calculated Shannon entropy value, or one
+            value per sequence for a batch
         """
-        _, counts = np.unique(data, return_counts=True)
-        probabilities = counts / len(data)
-
-        if base == 2:
-            entropy = -sum(p * log2(p) for p in probabilities)
-        else:
-            entropy = -sum(p * np.log(p) / np.log(base) for p in probabilities)
+        if (
+            isinstance(data, BINARY_REPRESENTATIONS)
+            and axis is None
+            and offsets is None
+        ):
+            return entropy_from_counts(data.symbol_counts(), base)
+        if axis is None and offsets is None:
+            return entropy_from_counts(symbol_counts(data), base)
+
+        flat, offsets, shape = batch_segments(data, axis, offsets)
+        segments = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        return segment_entropy(flat, segments, len(offsets) - 1, base).reshape(shape)
+
+    def approximate_entropy(
+        self,
+        time_series: np.ndarray,
+        m: int,
+        r: float,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        method: str = "auto",
+        workers: Optional[int] = None,
+        neighbors: Optional[Tuple[Any, Any]] = None,
+    ) -> float:
+        """Calculate Approximate Entropy (ApEn) for a time series.
 
-        return entropy
+        Args:
+            time_series: Input time series data, or a SparseOneHot or
+                PackedBits whose templates are matched by key when 0 < r <= 1
+            m: Embedding dimension
+            r: Tolerance value (typically 0.2 * std of the time series)
+            tile_size: Edge length of the distance tiles, caps peak memory
+                at roughly tile_size**2 distances
+            method: Template matching backend, one of "auto", "brute",
+                "sorted", "hashed" or "jit", defaults to "auto"
+            workers: Number of threads the template rows are split across,
+                defaults to None for a single thread
+            neighbors: Neighbors precomputed by count_neighbors() with the
+                same m and r, defaults to None to count them
 
-    def approximate_entropy(self, time_series: np.ndarray, m: int, r: float) -> float:
-        """Calculate Approximate Entropy (ApEn) for a time series.
+        Returns:
+            float: Calculated ApEn value
+        """
+        if neighbors is None:
+            neighbors = self.count_neighbors(
+                time_series, m, r, tile_size, method, workers
+            )
+        return self._phi_difference(time_series, m, r, neighbors)
+
+    def tolerance_sweep(
+        self,
+        time_series: np.ndarray,
+        m: int,
+        r_values: Sequence[float],
+        tile_size: int = DEFAULT_TILE_SIZE,
+    ) -> SweepResult:
+        """Calculate SampEn and ApEn for a whole grid of tolerance values.
+
+        Pairwise distances are computed once and binned against the grid, so
+        the sweep costs about as much as a single evaluation.
 
         Args:
             time_series: Input time series data
             m: Embedding dimension
+            r_values: Tolerance values to evaluate
+            tile_size: Edge length of the distance tiles, caps peak memory
+                at roughly tile_size**2 distances
+
+        Returns:
+            SweepResult: SampEn, ApEn and match counts for every tolerance
+        """
+        x = as_series(time_series)
+        N = len(x)
+        r_values = np.asarray(r_values, dtype=np.float64).ravel()
+        order = np.argsort(r_values)
+        counts_m, counts_m1 = sweep_neighbor_counts(x, m, r_values[order], tile_size)
+
+        sample, approximate, matches, extended_matches = [], [], [], []
+        for column in np.argsort(order):
+            r = r_values[order[column]]
+            neighbors = (counts_m[:, column], counts_m1[:, column])
+            A, B = self._matching_pairs(neighbors, m, N)
+            sample.append(self._sample_entropy_value(A, B))
+            approximate.append(float(self._phi_difference(x, m, r, neighbors)))
+            matches.append(int(B))
+            extended_matches.append(int(A))
+
+        return SweepResult(
+            parameter="r",
+            values=r_values.tolist(),
+            sample_entropy=sample,
+            approximate_entropy=approximate,
+            matches=matches,
+            extended_matches=extended_matches,
+        )
+
+    def dimension_sweep(
+        self,
+        time_series: np.ndarray,
+        max_m: int,
+        r: float,
+        tile_size: int = DEFAULT_TILE_SIZE,
+    ) -> SweepResult:
+        """Calculate SampEn and ApEn for every embedding dimension up to max_m.
+
+        Matching pairs are found once at dimension 1 and extended one
+        dimension at a time, so the whole curve costs about as much as the
+        evaluation at m = 1.
+
+        Args:
+            time_series: Input time series data
+            max_m: Largest embedding dimension, dimensions 1..max_m are
+                evaluated
             r: Tolerance value (typically 0.2 * std of the time series)
+            tile_size: Edge length of the distance tiles, caps peak memory
+                at roughly tile_size**2 distances
+
+        Returns:
+            SweepResult: SampEn, ApEn and match counts for every dimension
+        """
+        x = as_series(time_series)
+        N = len(x)
+        counts = dimension_neighbor_counts(x, max_m + 1, r, tile_size)
+
+        sample, approximate, matches, extended_matches = [], [], [], []
+        for m in range(1, max_m + 1):
+            neighbors = (counts[m - 1], counts[m])
+            A, B = self._matching_pairs(neighbors, m, N)
+            sample.append(self._sample_entropy_value(A, B))
+            approximate.append(float(self._phi_difference(x, m, r, neighbors)))
+            matches.append(int(B))
+            extended_matches.append(int(A))
+
+        return SweepResult(
+            parameter="m",
+            values=list(range(1, max_m + 1)),
+            sample_entropy=sample,
+            approximate_entropy=approximate,
+            matches=matches,
+            extended_matches=extended_matches,
+        )
+
+    def _phi(self, x: np.ndarray, m_val: int, r: float, neighbors: np.ndarray) -> float:
+        """Calculate the ApEn phi value from template neighbor counts.
+
+        Args:
+            x: Input 1D series
+            m_val: Embedding dimension value
+            r: Tolerance value
+            neighbors: Neighbor counts of the m_val-dimensional templates
+
+        Returns:
+            float: Calculated phi value
+        """
+        count = (neighbors + self_matches(x, m_val, r)).astype(np.float64)
+        n_templates = len(count)
+        return np.sum(np.log(count / n_templates)) / n_templates
+
+    def _phi_difference(
+        self, time_series: Any, m: int, r: float, neighbors: Tuple[Any, Any]
+    ) -> float:
+        """Calculate ApEn from the neighbors at dimensions m and m + 1.
+
+        Args:
+            time_series: Series the neighbors were counted on
+            m: Embedding dimension
+            r: Tolerance value
+            neighbors: Neighbors as returned by count_neighbors()
 
         Returns:
             float: Calculated ApEn value
         """
-        N = len(time_series)
+        neighbors_m, neighbors_m1 = neighbors
+        if isinstance(neighbors_m, tuple):
+            return abs(template_phi(neighbors_m) - template_phi(neighbors_m1))
+
+        if isinstance(time_series, BINARY_REPRESENTATIONS):
+            time_series = time_series.toarray()
+        x = as_series(time_series)
+        return abs(
+            self._phi(x, m, r, neighbors_m) - self._phi(x, m + 1, r, neighbors_m1)
+        )
+
+    def _matching_pairs(
+        self, neighbors: Tuple[Any, Any], m: int, n: int
+    ) -> Tuple[int, int]:
+        """Count the matching template pairs behind Sample Entropy.
+
+        The last template of dimension m is left out, so that both
+        dimensions compare the same len(x) - m templates.
+
+        Args:
+            neighbors: Neighbors as returned by count_neighbors()
+            m: Embedding dimension
+            n: Length of the series
+
+        Returns:
+            Tuple[int, int]: Matching pairs A at dimension m + 1 and B at
+            dimension m
+        """
+        neighbors_m, neighbors_m1 = neighbors
+        if isinstance(neighbors_m, tuple):
+            return matching_pairs(neighbors_m1), matching_pairs(neighbors_m)
+        return int(np.sum(neighbors_m1[: n - m - 1])), int(np.sum(neighbors_m[: n - m]))
 
-        def _phi(m_val: int) -> float:
-            """Calculate phi value for given m.
+    def _sample_entropy_value(self, A: int, B: int) -> float:
+        """Calculate SampEn from its matching template pairs.
 
-            Args:
-                m_val: Embedding dimension value
+        Args:
+            A: Matching pairs at dimension m + 1
+            B: Matching pairs at dimension m
 
-            Returns:
-                float: Calculated phi value
-            """
-            count = np.zeros(N - m_val + 1)
+        Returns:
+            float: Calculated SampEn value, inf when no pair matches
+        """
+        return float(-np.log(A / B)) if B > 0 and A > 0 else np.inf
 
-            for i in range(N - m_val + 1):
-                template = time_series[i : i + m_val]
-                for j in range(N - m_val + 1):
-                    if max(abs(template - time_series[j : j + m_val])) < r:
-                        count[i] += 1
-            return np.sum(np.log(count / (N - m_val + 1))) / (N - m_val + 1)
+    def histogram_entropy(self, counts: np.ndarray, base: int = 2) -> float:
+        """Calculate the entropy of precomputed occurrence counts.
 
-        return abs(_phi(m) - _phi(m + 1))
+        Args:
+            counts: Occurrence counts, such as symbol or ordinal pattern
+                counts, possibly including zeros
+            base: Base for logarithm calculation, defaults to 2
 
-    def sample_entropy(self, time_series: np.ndarray, m: int, r: float) -> float:
+        Returns:
+            float: Calculated entropy value
+        """
+        return entropy_from_counts(counts, base)
+
+    def sample_entropy(
+        self,
+        time_series: np.ndarray,
+        m: int,
+        r: float,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        method: str = "auto",
+        workers: Optional[int] = None,
+        neighbors: Optional[Tuple[Any, Any]] = None,
+    ) -> float:
         """Calculate Sample Entropy (SampEn) for a time series.
 
         Args:
-            time_series: Input time series data
+            time_series: Input time series data, or a SparseOneHot or
+                PackedBits whose templates are matched by key when 0 < r <= 1
             m: Embedding dimension
             r: Tolerance value (typically 0.2 * std of the time series)
+            tile_size: Edge length of the distance tiles, caps peak memory
+                at roughly tile_size**2 distances
+            method: Template matching backend, one of "auto", "brute",
+                "sorted", "hashed" or "jit", or "sampled" for a Monte-Carlo
+                estimate, defaults to "auto"
+            workers: Number of threads the template rows are split across,
+                defaults to None for a single thread
+            neighbors: Neighbors precomputed by count_neighbors() with the
+                same m and r, defaults to None to count them
 
         Returns:
             float: Calculated SampEn value
         """
-        N = len(time_series)
-
-        A = 0
-        B = 0
-
-        def create_vectors(dim: int) -> np.ndarray:
-            """Create embedding vectors for given dimension.
+        if neighbors is None:
+            if method == "sampled" and not (
+                isinstance(time_series, BINARY_REPRESENTATIONS)
+                and matches_by_key(m + 1, r)
+            ):
+                return self.sample_entropy_estimate(time_series, m, r).entropy
+            neighbors = self.count_neighbors(
+                time_series, m, r, tile_size, method, workers
+            )
+
+        A, B = self._matching_pairs(neighbors, m, len(time_series))
+        return self._sample_entropy_value(A, B)
+
+    def sample_entropy_estimate(
+        self,
+        time_series: np.ndarray,
+        m: int,
+        r: float,
+        max_pairs: int = DEFAULT_SAMPLED_PAIRS,
+        rel_error: Optional[float] = None,
+        confidence: float = 0.95,
+        seed: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        batch_size: int = DEFAULT_MAX_PAIRS,
+    ) -> SampledEntropy:
+        """Estimate Sample Entropy (SampEn) from randomly sampled template pairs.
+
+        SampEn is -log of the probability that two templates matching at
+        dimension m also match at dimension m + 1. Pairs are drawn in batches
+        until max_pairs is reached, the confidence interval is narrower than
+        rel_error relative to the estimate, or time_budget runs out. Series
+        with no more than max_pairs pairs are evaluated exactly instead.
 
-            Args:
-                dim: Embedding dimension
-
-            Returns:
-                np.ndarray: Array of embedding vectors
-            """
-            vectors = []
-            for i in range(N - dim + 1):
-                vectors.append(time_series[i : i + dim])
-            return np.array(vectors)
+        Args:
+            time_series: Input time series data
+            m: Embedding dimension
+            r: Tolerance value (typically 0.2 * std of the time series)
+            max_pairs: Maximum number of pairs to draw
+            rel_error: Target half-width of the confidence interval relative
+                to the estimate, defaults to None to draw max_pairs pairs
+            confidence: Confidence level of the interval, defaults to 0.95
+            seed: Seed of the random generator, a fresh one is drawn and
+                reported when None
+            time_budget: Maximum sampling time in seconds
+            batch_size: Number of pairs drawn per batch
 
-        xm = create_vectors(m)
-        xm1 = create_vectors(m + 1)
+        Returns:
+            SampledEntropy: Estimate with its confidence interval and seed
+        """
+        x = as_series(time_series)
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+        n_templates = len(x) - m
+        if n_templates * (n_templates - 1) <= max_pairs:
+            A, B = self._matching_pairs(self.count_neighbors(x, m, r), m, len(x))
+            entropy = self._sample_entropy_value(A, B)
+            return SampledEntropy(
+                entropy=entropy,
+                ci_low=entropy,
+                ci_high=entropy,
+                confidence=confidence,
+                seed=seed,
+                pairs=max(n_templates * (n_templates - 1), 0),
+                matches=int(B),
+                extended_matches=int(A),
+            )
+
+        rng = np.random.default_rng(seed)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        deadline = None if time_budget is None else perf_counter() + time_budget
+        pairs = B = A = 0
+
+        while pairs < max_pairs:
+            batch = min(batch_size, max_pairs - pairs)
+            matches, extended = sampled_matches(x, m, r, rng, batch)
+            pairs += batch
+            B += matches
+            A += extended
+            if deadline is not None and perf_counter() >= deadline:
+                break
+            if rel_error is not None and A > 0:
+                entropy = self._sample_entropy_value(A, B)
+                half_width = z * np.sqrt((1 - A / B) / A)
+                if half_width <= rel_error * abs(entropy):
+                    break
+
+        if A == 0:
+            entropy = ci_low = ci_high = np.inf
+        else:
+            # A given B is binomial with rate q = A / B, so by the delta
+            # method the standard error of log(q) is sqrt((1 - q) / A).
+            entropy = self._sample_entropy_value(A, B)
+            half_width = z * np.sqrt((1 - A / B) / A)
+            ci_low, ci_high = entropy - half_width, entropy + half_width
+
+        return SampledEntropy(
+            entropy=entropy,
+            ci_low=max(ci_low, 0.0),
+            ci_high=ci_high,
+            confidence=confidence,
+            seed=seed,
+            pairs=pairs,
+            matches=B,
+            extended_matches=A,
+        )
+
+    def count_neighbors(
+        self,
+        time_series: Any,
+        m: int,
+        r: float,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        method: str = "auto",
+        workers: Optional[int] = None,
+        max_pairs: int = DEFAULT_MAX_PAIRS,
+    ) -> Tuple[Any, Any]:
+        """Count the template neighbors at dimensions m and m + 1.
+
+        The neighbors can be counted once and handed to sample_entropy()
+        and approximate_entropy(), which then skip template matching.
 
-        for i in range(N - m):
-            distances = np.max(np.abs(xm[i] - xm), axis=1)
-            B += np.sum((distances < r) & (np.arange(len(distances)) != i))
+        Args:
+            time_series: Input time series data, or a SparseOneHot or
+                PackedBits whose templates are matched by key when 0 < r <= 1
+            m: Embedding dimension
+            r: Tolerance value
+            tile_size: Edge length of the distance tiles
+            method: Template matching backend, one of "auto", "brute",
+                "sorted", "hashed" or "jit", defaults to "auto"
+            workers: Number of threads sharing the pair comparisons
+            max_pairs: Maximum number of candidate pairs compared per batch
+                by the sorted backend
 
-        for i in range(N - m - 1):
-            distances = np.max(np.abs(xm1[i] - xm1), axis=1)
-            A += np.sum((distances < r) & (np.arange(len(distances)) != i))
+        Returns:
+            Tuple[Any, Any]: Neighbor counts of every template at dimension
+            m and m + 1, or the template multiplicities of both dimensions,
+            as returned by template_multiplicities(), for series matched
+            by key
 
-        return -np.log(A / B) if B > 0 and A > 0 else np.inf
+        Raises:
+            ValueError: If an unsupported matching method is specified
+        """
+        if isinstance(time_series, BINARY_REPRESENTATIONS):
+            if matches_by_key(m + 1, r):
+                return (
+                    time_series.template_multiplicities(m),
+                    time_series.template_multiplicities(m + 1),
+                )
+            time_series = time_series.toarray()
+
+        if method not in MATCHING_METHODS:
+            raise ValueError(f"Unsupported matching method: {method}")
+
+        x = as_series(time_series)
+
+        if method == "auto":
+            method = select_method(x, m, r)
+
+        if method == "jit":
+            if not supports_jit(x):
+                raise ValueError(
+                    f"Compiled matching is unavailable: {jit_unavailable_reason()}"
+                    if not JIT_AVAILABLE
+                    else "Compiled matching supports float64 and integer series only"
+                )
+            return compiled_neighbor_counts(x, m, r, workers)
+        if method == "hashed":
+            return hashed_neighbor_counts(x, m, r)
+        if method == "sorted":
+            return sorted_neighbor_counts(x, m, r, max_pairs, workers)
+        return neighbor_counts(x, m, r, tile_size, workers)
 
     def permutation_entropy(
-        self, time_series: np.ndarray, order: int = 3, delay: int = 1
-    ) -> float:
+        self,
+        time_series: np.ndarray,
+        order: int = 3,
+        delay: int = 1,
+        axis: Optional[int] = None,
+        offsets: Optional[Sequence[int]] = None,
+    ) -> Union[float, np.ndarray]:
         """Calculate Permutation Entropy for a time series.
 
         Args:
-            time_series: Input time series data
+            time_series: Input time series data, a SparseOneHot or
+                PackedBits, or a batch of series when axis or offsets is given
             order: Permutation order, defaults to 3
             delay: Time delay, defaults to 1
+            axis: Axis along which the series of an array batch run
+            offsets: Boundaries of a ragged batch of concatenated series,
+                series k spans time_series[offsets[k]:offsets[k + 1]]
 
         Returns:
-            float: Calculated permutation entropy value
+            Union[float, np.ndarray]: Calculated permutation entropy value, or
+            one value per series for a batch
+
+        Raises:
+            ValueError: If the order exceeds MAX_ORDER
         """
-        n = len(time_series)
-        permutation_counts = {}
+        if (
+            isinstance(time_series, BINARY_REPRESENTATIONS)
+            and axis is None
+            and offsets is None
+        ):
+            return entropy_from_counts(time_series.ordinal_pattern_counts(order, delay))
+        if axis is None and offsets is None:
+            x = as_series(time_series)
+            return entropy_from_counts(ordinal_pattern_counts(x, order, delay))
+
+        flat, offsets, shape = batch_segments(time_series, axis, offsets)
+        n_series = len(offsets) - 1
+        codes = ordinal_patterns(flat, order, delay)
+
+        # Patterns are computed over the concatenated series and the ones
+        # straddling two series are dropped afterwards.
+        span = delay * (order - 1) + 1
+        segments = np.repeat(np.arange(n_series), np.diff(offsets))[: len(codes)]
+        inside = np.arange(len(codes)) + span <= offsets[segments + 1]
+        return segment_entropy(codes[inside], segments[inside], n_series).reshape(shape)
+
+    def rolling_shannon_entropy(
+        self, data: Sequence[Any], window: int, base: int = 2
+    ) -> np.ndarray:
+        """Calculate the Shannon entropy profile of a sliding window.
 
-        for i in range(n - delay * (order - 1)):
-            pattern = time_series[i : i + delay * order : delay]
-            sorted_idx = np.argsort(pattern)
-            pattern_key = tuple(sorted_idx)
+        Args:
+            data: Input sequence data to analyze
+            window: Number of symbols per window
+            base: Base for logarithm calculation, defaults to 2
+
+        Returns:
+            np.ndarray: Shannon entropy of every window, one per start position
+        """
+        return rolling_entropy(data, window, base)
+
+    def rolling_permutation_entropy(
+        self, time_series: np.ndarray, window: int, order: int = 3, delay: int = 1
+    ) -> np.ndarray:
+        """Calculate the permutation entropy profile of a sliding window.
+
+        Args:
+            time_series: Input time series data
+            window: Number of samples per window
+            order: Permutation order, defaults to 3
+            delay: Time delay, defaults to 1
 
-            if pattern_key in permutation_counts:
-                permutation_counts[pattern_key] += 1
-            else:
-                permutation_counts[pattern_key] = 1
+        Returns:
+            np.ndarray: Permutation entropy of every window, one per start position
 
-        total = sum(permutation_counts.values())
-        probabilities = [count / total for count in permutation_counts.values()]
+        Raises:
+            ValueError: If the window is too short to hold a single pattern,
+                or the order exceeds MAX_ORDER
+        """
+        span = delay * (order - 1) + 1
+        if window < span:
+            raise ValueError("window must span at least one ordinal pattern")
 
-        return -sum(p * log2(p) for p in probabilities)
+        x = as_series(time_series)
+        codes = ordinal_patterns(x, order, delay)
+        return rolling_entropy(codes, window - span + 1)
 
     def multiscale_entropy(
-        self, time_series: np.ndarray, scale_range: int = 10, m: int = 2, r: float = 0.2
+        self,
+        time_series: np.ndarray,
+        scale_range: int = 10,
+        m: int = 2,
+        r: float = 0.2,
+        workers: Optional[int] = None,
     ) -> np.ndarray:
         """Calculate Multiscale Entropy for a time series.
 
@@ -152,15 +605,37 @@ class Algorithms:
             scale_range: Maximum scale factor, defaults to 10
             m: Embedding dimension, defaults to 2
             r: Tolerance value, defaults to 0.2
+            workers: Number of worker processes to spread the scales over,
+                defaults to None which evaluates them serially
 
         Returns:
             np.ndarray: Array of multiscale entropy values for each scale factor
         """
-        r = r * np.std(time_series, ddof=1)
+        x = as_series(time_series)
+        r = r * series_std(x, ddof=1)
         mse = np.zeros(scale_range)
 
+        # A single scale gains nothing from a pool of worker processes.
+        if workers is not None and workers > 1 and scale_range > 1:
+            # The series is handed to each worker once through the pool
+            # initializer. Scales are submitted finest first since scale 1
+            # is the longest and most expensive series, which keeps the
+            # pool evenly loaded as the cheaper scales fill in the gaps.
+            with ProcessPoolExecutor(
+                max_workers=min(workers, scale_range),
+                initializer=_init_multiscale_worker,
+                initargs=(x,),
+            ) as executor:
+                futures = {
+                    scale: executor.submit(_multiscale_worker, scale, m, r)
+                    for scale in range(1, scale_range + 1)
+                }
+                for scale, future in futures.items():
+                    mse[scale - 1] = future.result()
+            return mse
+
         for scale in range(1, scale_range + 1):
-            coarse_grained = self._coarse_grain(time_series, scale)
+            coarse_grained = self._coarse_grain(x, scale)
             mse[scale - 1] = self.sample_entropy(coarse_grained, m, r)
 
         return mse
@@ -175,10 +650,38 @@ class Algorithms:
         Returns:
             np.ndarray: Coarse-grained time series
         """
-        N = len(time_series)
-        result = np.zeros(int(N / scale))
+        x = as_series(time_series)
+        n_points = len(x) // scale
+        if scale == 1:
+            return x[:n_points].astype(np.float64, copy=False)
+        windows = x[: n_points * scale].reshape(n_points, scale)
+        return windows.mean(axis=1).astype(np.float64, copy=False)
+
+
+_multiscale_series: Optional[np.ndarray] = None
+
+
+def _init_multiscale_worker(series: np.ndarray) -> None:
+    """Store the input series in a multiscale entropy worker process.
+
+    Args:
+        series: Input time series shared by every scale
+    """
+    global _multiscale_series
+    _multiscale_series = series
+
+
+def _multiscale_worker(scale: int, m: int, r: float) -> float:
+    """Calculate the sample entropy of one coarse-grained scale.
 
-        for i in range(0, int(N / scale)):
-            result[i] = np.mean(time_series[i * scale : (i + 1) * scale])
+    Args:
+        scale: Scale factor for coarse-graining
+        m: Embedding dimension
+        r: Absolute tolerance value
 
-        return result
+    Returns:
+        float: Sample entropy at the given scale
+    """
+    algorithms = Algorithms()
+    coarse_grained = algorithms._coarse_grain(_multiscale_series, scale)
+    return algorithms.sample_entropy(coarse_grained, m, r)
@@ -3,9 +3,17 @@ A sophisticated text encoding module that provides various encoding algorithms f
 This module implements different encoding strategies optimized for entropy analysis.
 """
 
+import codecs
 from enum import Enum
+from typing import Any, Optional, Tuple, Union
 import numpy as np
+from numpy.typing import DTypeLike
+from .kernels import MIN_BINCOUNT_SYMBOLS
 from .models import EncodingModel
+from .representations import PackedBits, SparseOneHot
+
+# Codec names of the text encodings the binary encoding accepts.
+BINARY_TEXT_ENCODINGS = ("utf-8", "iso8859-1")
 
 
 class ChaosEncoder:
@@ -15,15 +23,21 @@ class ChaosEncoder:
         """Initialize the ChaosEncoder."""
         pass
 
-    def encode(self, text: str, model: EncodingModel) -> np.ndarray:
+    def encode(
+        self, text: str, model: EncodingModel, **options: Any
+    ) -> Union[np.ndarray, SparseOneHot]:
         """Encode text using the specified encoding model.
 
         Args:
             text: Input text to encode
             model: Encoding model to use from EncodingModel enum
+            **options: Options of the encoding model, such as the dtype of
+                the ordinal encoding
 
         Returns:
-            np.ndarray: Encoded text as a 1D numpy array
+            Union[np.ndarray, SparseOneHot]: Encoded text as a 1D numpy
+            array, or a sparse one-hot encoding when requested with
+            dense=False
 
         Raises:
             ValueError: If an invalid encoding model is specified
@@ -38,64 +52,168 @@ class ChaosEncoder:
         if model not in encoding_methods:
             raise ValueError(f"Unsupported encoding model: {model}")
 
-        return encoding_methods[model](text)
+        return encoding_methods[model](text, **options)
 
-    def _ordinal_encode(self, text: str) -> np.ndarray:
+    def _ordinal_encode(self, text: str, dtype: DTypeLike = np.int32) -> np.ndarray:
         """Encode text using ordinal encoding (character to number mapping).
 
+        The text is encoded to Latin-1 when every character fits in a byte,
+        and to UTF-32-LE otherwise, and the bytes are viewed as code points
+        without creating a Python object per character.
+
         Args:
             text: Input text to encode
+            dtype: Integer dtype of the code points, defaults to int32
 
         Returns:
             np.ndarray: Ordinal encoded array
-        """
-        return np.array([ord(c) for c in text], dtype=np.int32)
 
-    def _one_hot_encode(self, text: str) -> np.ndarray:
+        Raises:
+            ValueError: If dtype is not an integer dtype or cannot hold
+                every code point of the text
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind not in "iu":
+            raise ValueError(f"Ordinal encoding requires an integer dtype, got {dtype}")
+
+        try:
+            codes = np.frombuffer(text.encode("latin-1"), dtype=np.uint8)
+        except UnicodeEncodeError:
+            # Lone surrogates are valid str code points but not valid UTF-32.
+            # Code points stay below 2**21, so the words are read as int32
+            # and the default dtype needs no copy.
+            raw = text.encode("utf-32-le", errors="surrogatepass")
+            codes = np.frombuffer(raw, dtype="<i4")
+        if codes.size > 0 and codes.max() > np.iinfo(dtype).max:
+            raise ValueError(f"Code points of the text do not fit in {dtype}")
+        return codes.astype(dtype, copy=False)
+
+    def _one_hot_encode(
+        self, text: str, dense: bool = True, ordinals: Optional[np.ndarray] = None
+    ) -> Union[np.ndarray, SparseOneHot]:
         """Encode text using one-hot encoding.
 
+        Columns follow the sorted distinct characters. The dense matrix takes
+        len(text) times the alphabet size in memory, whereas the sparse
+        encoding holds one column index per character and is understood
+        natively by the algorithms.
+
         Args:
             text: Input text to encode
+            dense: Whether to return the dense flattened matrix rather than
+                the sparse encoding, defaults to True
+            ordinals: Ordinal encoding of the text, computed if not given
 
         Returns:
-            np.ndarray: Flattened one-hot encoded array
+            Union[np.ndarray, SparseOneHot]: Flattened one-hot encoded array,
+            or the sparse one-hot encoding when dense is not set
         """
-        unique_chars = sorted(list(set(text)))
-        char_to_idx = {c: i for i, c in enumerate(unique_chars)}
-
-        encoded = np.zeros((len(text), len(unique_chars)))
-        for i, char in enumerate(text):
-            encoded[i, char_to_idx[char]] = 1
-
-        return encoded.flatten()
-
-    def _frequency_encode(self, text: str) -> np.ndarray:
+        if ordinals is None:
+            ordinals = self._ordinal_encode(text)
+        counts, indices = self._symbol_table(ordinals)
+        encoded = SparseOneHot(indices.astype(np.int32), len(counts))
+        return encoded.toarray() if dense else encoded
+
+    def _frequency_encode(
+        self, text: str, ordinals: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """Encode text using frequency-based encoding.
 
         Args:
             text: Input text to encode
+            ordinals: Ordinal encoding of the text, computed if not given
 
         Returns:
             np.ndarray: Frequency encoded array
         """
-        char_freq = {}
-        for char in text:
-            char_freq[char] = char_freq.get(char, 0) + 1
+        if ordinals is None:
+            ordinals = self._ordinal_encode(text)
+        all_counts = self._code_point_counts(ordinals)
+        if all_counts is not None:
+            return all_counts[ordinals] / len(ordinals)
+        counts, inverse = self._symbol_table(ordinals)
+        return counts[inverse] / len(ordinals)
 
-        total_chars = len(text)
-        return np.array([char_freq[c] / total_chars for c in text])
+    def _symbol_table(self, ordinals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Count the distinct characters of an ordinal encoding.
 
-    def _binary_encode(self, text: str) -> np.ndarray:
-        """Encode text using binary encoding (ASCII to binary).
+        Characters counted by code point are looked up in a table indexed
+        by code point, others fall back to the sort-based np.unique.
+
+        Args:
+            ordinals: Ordinal encoding of a text
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Occurrence count of every distinct
+            character in code point order, and the position of every
+            character of the text among them
+        """
+        all_counts = self._code_point_counts(ordinals)
+        if all_counts is not None:
+            present = np.flatnonzero(all_counts)
+            lookup = np.zeros(len(all_counts), dtype=np.intp)
+            lookup[present] = np.arange(len(present))
+            return all_counts[present], lookup[ordinals]
+        _, inverse, counts = np.unique(
+            ordinals, return_inverse=True, return_counts=True
+        )
+        return counts, inverse
+
+    def _code_point_counts(self, ordinals: np.ndarray) -> Optional[np.ndarray]:
+        """Count the characters of an ordinal encoding by code point.
+
+        Only code points below MIN_BINCOUNT_SYMBOLS, or below twice the
+        length, are counted, so the table stays proportional to the text.
+
+        Args:
+            ordinals: Ordinal encoding of a text
+
+        Returns:
+            Optional[np.ndarray]: Occurrence count indexed by code point, or
+            None if the code points are too sparse to be counted this way
+        """
+        if len(ordinals) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if ordinals.max() < max(2 * len(ordinals), MIN_BINCOUNT_SYMBOLS):
+            return np.bincount(ordinals)
+        return None
+
+    def _binary_encode(
+        self, text: str, encoding: str = "utf-8", packed: bool = False
+    ) -> Union[np.ndarray, PackedBits]:
+        """Encode text using binary encoding (bits of the encoded bytes).
+
+        The text is encoded to bytes once and every byte is expanded to its
+        8 bits, most significant first, by np.unpackbits. Characters taking
+        several bytes in UTF-8 yield 8 bits per byte.
 
         Args:
             text: Input text to encode
+            encoding: Text encoding of the bytes, "utf-8" (default) or
+                "latin-1"
+            packed: Whether to keep the bits packed 8 per byte, in the
+                np.packbits layout, defaults to False
 
         Returns:
-            np.ndarray: Binary encoded array
+            Union[np.ndarray, PackedBits]: Binary encoded int8 array, or the
+            packed bits when packed is set
+
+        Raises:
+            ValueError: If the encoding is unsupported or cannot represent
+                the text
         """
-        binary_list = []
-        for char in text:
-            binary = format(ord(char), "08b")
-            binary_list.extend([int(b) for b in binary])
-        return np.array(binary_list, dtype=np.int8)
+        try:
+            name = codecs.lookup(encoding).name
+        except LookupError:
+            name = None
+        if name not in BINARY_TEXT_ENCODINGS:
+            raise ValueError(f"Unsupported binary text encoding: {encoding}")
+        try:
+            raw = text.encode(encoding, errors="surrogatepass")
+        except UnicodeEncodeError as e:
+            raise ValueError(f"Text cannot be encoded as {encoding}: {str(e)}")
+
+        data = np.frombuffer(raw, dtype=np.uint8)
+        if packed:
+            return PackedBits(data, 8 * len(data))
+        return np.unpackbits(data).view(np.int8)
@@ -0,0 +1,154 @@
+"""
+Optional compiled kernels for the entropy algorithms, built with Numba when it is installed.
+This module exposes JIT_AVAILABLE and leaves the kernels set to None when Numba cannot be used.
+"""
+
+import os
+import numpy as np
+from typing import Optional, Tuple
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+
+JIT_AVAILABLE = numba is not None and not os.environ.get("CHAOS_DISABLE_NUMBA")
+
+jit_neighbor_counts = None
+jit_ordinal_patterns = None
+
+
+def supports_jit(x: np.ndarray) -> bool:
+    """Check whether the compiled kernels can handle a series.
+
+    Only float64 and integer series are compiled, integers being widened
+    to int64, for which comparisons against r promote exactly as they do
+    in the NumPy kernels.
+
+    Args:
+        x: Input 1D series
+
+    Returns:
+        bool: True if Numba is available and the dtype is supported
+    """
+    return JIT_AVAILABLE and (x.dtype.kind in "iub" or x.dtype == np.float64)
+
+
+if JIT_AVAILABLE:
+
+    @numba.njit(cache=True, nogil=True)
+    def jit_neighbor_counts(
+        x: np.ndarray, m: int, r: float, start: int = 0, step: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Count template neighbors at dimensions m and m + 1 in compiled loops.
+
+        Every pair i < j is visited once and compared coordinate by
+        coordinate, stopping at the first coordinate that is not within r.
+        Only rows start, start + step, ... are visited, so that interleaved
+        row sets can be counted concurrently. Self-matches are excluded.
+
+        Args:
+            x: Input 1D series
+            m: Embedding dimension
+            r: Tolerance value, pairs with distance strictly below r match
+            start: First row template index
+            step: Stride between visited rows
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Neighbor counts of the
+            len(x) - m + 1 templates of dimension m and of the len(x) - m
+            templates of dimension m + 1
+        """
+        n_m = len(x) - m + 1
+        n_m1 = max(n_m - 1, 0)
+        counts_m = np.zeros(n_m, dtype=np.int64)
+        counts_m1 = np.zeros(n_m1, dtype=np.int64)
+
+        for i in range(start, n_m, step):
+            for j in range(i + 1, n_m):
+                matched = True
+                for k in range(m):
+                    if not abs(x[i + k] - x[j + k]) < r:
+                        matched = False
+                        break
+                if not matched:
+                    continue
+                counts_m[i] += 1
+                counts_m[j] += 1
+                if j < n_m1 and abs(x[i + m] - x[j + m]) < r:
+                    counts_m1[i] += 1
+                    counts_m1[j] += 1
+
+        return counts_m, counts_m1
+
+    @numba.njit(cache=True, nogil=True)
+    def jit_ordinal_patterns(
+        x: np.ndarray, order: int, delay: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode the ordinal pattern of every delayed window in compiled loops.
+
+        The rank of every sample is found by pairwise comparisons and
+        inverted into the argsort permutation of the window, whose Lehmer
+        code is then accumulated. This equals the NumPy kernel as long as
+        the window holds no ties, which are flagged so that the caller can
+        resolve them with the same sort.
+
+        Args:
+            x: Input 1D series
+            order: Permutation order
+            delay: Time delay between samples of a window
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Lehmer code of every window and a
+            flag marking the windows that contain ties
+        """
+        span = delay * (order - 1) + 1
+        n_windows = max(len(x) - span + 1, 0)
+        codes = np.zeros(n_windows, dtype=np.int64)
+        tied = np.zeros(n_windows, dtype=np.bool_)
+
+        weights = np.ones(order, dtype=np.int64)
+        for k in range(order - 2, -1, -1):
+            weights[k] = weights[k + 1] * (order - 1 - k)
+
+        ranks = np.empty(order, dtype=np.int64)
+        permutation = np.empty(order, dtype=np.int64)
+        for w in range(n_windows):
+            ranks[:] = 0
+            for a in range(order):
+                value = x[w + a * delay]
+                for b in range(a + 1, order):
+                    other = x[w + b * delay]
+                    ranks[a] += other < value
+                    ranks[b] += other > value
+            # Ties leave two samples with the same rank and some rank unused.
+            seen = 0
+            for a in range(order):
+                seen |= 1 << ranks[a]
+            if seen != (1 << order) - 1:
+                tied[w] = True
+                continue
+            for a in range(order):
+                permutation[ranks[a]] = a
+            code = 0
+            for k in range(order - 1):
+                smaller = 0
+                for l in range(k + 1, order):
+                    smaller += permutation[l] < permutation[k]
+                code += smaller * weights[k]
+            codes[w] = code
+
+        return codes, tied
+
+
+def jit_unavailable_reason() -> Optional[str]:
+    """Explain why the compiled kernels are disabled.
+
+    Returns:
+        Optional[str]: Reason, or None if the kernels are available
+    """
+    if numba is None:
+        return "numba is not installed"
+    if not JIT_AVAILABLE:
+        return "disabled by the CHAOS_DISABLE_NUMBA environment variable"
+    return None
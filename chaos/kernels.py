@@ -0,0 +1,1071 @@
+"""
+Low-level NumPy kernels shared by the entropy algorithms.
+This module provides the embedding and template-matching primitives used by the Algorithms class.
+"""
+
+import numpy as np
+from math import factorial
+from numpy.lib.stride_tricks import sliding_window_view
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+from .jit import JIT_AVAILABLE, jit_neighbor_counts, jit_ordinal_patterns, supports_jit
+
+DEFAULT_TILE_SIZE = 1024
+DEFAULT_MAX_PAIRS = 1 << 20
+DEFAULT_SAMPLED_PAIRS = 1 << 24
+MATCHING_METHODS = ("auto", "brute", "sorted", "hashed", "jit")
+SORTED_MIN_TEMPLATES = 4096
+SORTED_MAX_CANDIDATE_RATIO = 0.25
+DEFAULT_CHUNK_SIZE = 1 << 16
+MAX_BINCOUNT_PATTERNS = 1 << 22
+MIN_BINCOUNT_SYMBOLS = 1 << 16
+MAX_JIT_ORDER = 20
+# Largest permutation order whose Lehmer codes fit in int64, 21! > 2**63.
+MAX_ORDER = 20
+
+
+def as_series(time_series: Any) -> np.ndarray:
+    """Convert input data to a 1D array without copying it when possible.
+
+    Arrays, including np.memmap, and objects exposing the buffer protocol
+    are wrapped as they are, so huge series stay on disk and are only read
+    block by block by the kernels. Raw bytes are read as uint8 samples.
+
+    Args:
+        time_series: Input time series data
+
+    Returns:
+        np.ndarray: 1D array view of the input, or a copy for non-contiguous
+        multi-dimensional arrays and plain sequences
+    """
+    if isinstance(time_series, (bytes, bytearray)):
+        return np.frombuffer(time_series, dtype=np.uint8)
+    return np.asarray(time_series).ravel()
+
+
+def widen(values: np.ndarray) -> np.ndarray:
+    """Widen integer and boolean samples to int64 before taking differences.
+
+    Differences between narrow or unsigned integers would wrap around, so
+    every block of samples is widened right before it is compared.
+
+    Args:
+        values: Block of samples
+
+    Returns:
+        np.ndarray: The block itself, or an int64 copy of it
+    """
+    if values.dtype.kind in "iub" and values.dtype != np.int64:
+        return values.astype(np.int64)
+    return values
+
+
+def embed(x: np.ndarray, dim: int) -> np.ndarray:
+    """Build the delay-embedding matrix of a series as a read-only view.
+
+    Args:
+        x: Input 1D series
+        dim: Embedding dimension
+
+    Returns:
+        np.ndarray: View of shape (len(x) - dim + 1, dim), no data is copied
+    """
+    return sliding_window_view(x, dim)
+
+
+def chebyshev_block(
+    embedded: np.ndarray, i0: int, i1: int, j0: int, j1: int
+) -> np.ndarray:
+    """Compute Chebyshev distances between two ranges of embedding vectors.
+
+    Args:
+        embedded: Embedding matrix as returned by embed()
+        i0: First row template index (inclusive)
+        i1: Last row template index (exclusive)
+        j0: First column template index (inclusive)
+        j1: Last column template index (exclusive)
+
+    Returns:
+        np.ndarray: Distance block of shape (i1 - i0, j1 - j0)
+    """
+    rows = widen(embedded[i0:i1])
+    cols = widen(embedded[j0:j1])
+    dist = np.abs(rows[:, None, 0] - cols[None, :, 0])
+    for k in range(1, embedded.shape[1]):
+        np.maximum(dist, np.abs(rows[:, None, k] - cols[None, :, k]), out=dist)
+    return dist
+
+
+def self_matches(x: np.ndarray, dim: int, r: float) -> np.ndarray:
+    """Flag the templates that match themselves.
+
+    A template is at distance zero from itself unless it contains a
+    non-finite value, in which case the distance is undefined.
+
+    Args:
+        x: Input 1D series
+        dim: Embedding dimension
+        r: Tolerance value
+
+    Returns:
+        np.ndarray: Boolean array with one flag per template
+    """
+    n_templates = len(x) - dim + 1
+    if x.dtype.kind in "iub":
+        return np.full(n_templates, 0 < r)
+    finite = np.empty(n_templates, dtype=bool)
+    for start in range(0, n_templates, DEFAULT_CHUNK_SIZE):
+        stop = min(start + DEFAULT_CHUNK_SIZE, n_templates)
+        block = np.isfinite(x[start : stop + dim - 1])
+        finite[start:stop] = embed(block, dim).all(axis=1)
+    return finite & (0 < r)
+
+
+def run_blocks(
+    task: Callable[[List[Any]], Tuple[np.ndarray, ...]],
+    blocks: List[Any],
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, ...]:
+    """Run a counting task over blocks of work and reduce the partial counts.
+
+    With several workers the blocks are dealt out round-robin, which keeps
+    the load even when the cost of a block shrinks along the list as it
+    does for upper-triangle row blocks. The tasks run on a thread pool
+    since the NumPy and compiled kernels release the GIL.
+
+    Args:
+        task: Function counting over a list of blocks, returning count arrays
+        blocks: Units of work
+        workers: Number of threads, defaults to None for a serial run
+
+    Returns:
+        Tuple[np.ndarray, ...]: Element-wise sum of the counts of every task
+    """
+    if workers is None or workers <= 1 or len(blocks) <= 1:
+        return task(blocks)
+
+    workers = min(workers, len(blocks))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        partials = list(
+            executor.map(task, [blocks[k::workers] for k in range(workers)])
+        )
+    return tuple(np.sum(counts, axis=0) for counts in zip(*partials))
+
+
+def neighbor_counts(
+    x: np.ndarray,
+    m: int,
+    r: float,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count template neighbors at dimensions m and m + 1 in a single pass.
+
+    The distance between two (m + 1)-dimensional templates is the maximum of
+    their m-dimensional distance and the gap between their last samples, so
+    the extra coordinate is only compared for pairs that already matched at
+    dimension m. Matching is symmetric, so only tiles on or above the
+    diagonal are evaluated and each pair is credited to both templates.
+    Tiles hold at most tile_size x tile_size distances, which bounds the
+    peak memory use independently of the series length. Self-matches are
+    excluded.
+
+    Args:
+        x: Input 1D series
+        m: Embedding dimension
+        r: Tolerance value, pairs with distance strictly below r match
+        tile_size: Edge length of the distance tiles
+        workers: Number of threads sharing the rows of tiles
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Neighbor counts of the len(x) - m + 1
+        templates of dimension m and of the len(x) - m templates of
+        dimension m + 1
+    """
+    if tile_size < 1:
+        raise ValueError("tile_size must be a positive integer")
+
+    embedded = embed(x, m)
+    n_m = embedded.shape[0]
+    n_m1 = n_m - 1
+
+    def _count_rows(row_starts: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Count the neighbors found in the given rows of tiles.
+
+        Args:
+            row_starts: First template index of every row of tiles
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Partial neighbor counts
+        """
+        counts_m = np.zeros(n_m, dtype=np.int64)
+        counts_m1 = np.zeros(max(n_m1, 0), dtype=np.int64)
+
+        for i0 in row_starts:
+            i1 = min(i0 + tile_size, n_m)
+            for j0 in range(i0, n_m, tile_size):
+                j1 = min(j0 + tile_size, n_m)
+                matched = chebyshev_block(embedded, i0, i1, j0, j1) < r
+                if i0 == j0:
+                    np.fill_diagonal(matched, False)
+
+                rows, cols = np.nonzero(matched[: n_m1 - i0, : n_m1 - j0])
+                gap = widen(x[rows + i0 + m]) - widen(x[cols + j0 + m])
+                extended = np.abs(gap) < r
+                rows_m1 = counts_m1[i0 : min(i1, n_m1)]
+                rows_m1 += np.bincount(rows[extended], minlength=len(rows_m1))
+                counts_m[i0:i1] += np.count_nonzero(matched, axis=1)
+
+                # Diagonal tiles are symmetric and their row sums already hold
+                # every pair. A tile above the diagonal also accounts for its
+                # mirror image below it, credited through the column sums.
+                if i0 != j0:
+                    cols_m1 = counts_m1[j0 : min(j1, n_m1)]
+                    cols_m1 += np.bincount(cols[extended], minlength=len(cols_m1))
+                    counts_m[j0:j1] += np.count_nonzero(matched, axis=0)
+
+        return counts_m, counts_m1
+
+    return run_blocks(_count_rows, list(range(0, n_m, tile_size)), workers)
+
+
+def compiled_neighbor_counts(
+    x: np.ndarray, m: int, r: float, workers: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count template neighbors at dimensions m and m + 1 with compiled loops.
+
+    Args:
+        x: Input 1D float64 or integer series
+        m: Embedding dimension
+        r: Tolerance value, pairs with distance strictly below r match
+        workers: Number of threads, each taking every workers-th row
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Neighbor counts at dimension m and m + 1
+    """
+    x = widen(x)
+    stride = max(workers or 1, 1)
+
+    def _count_rows(offsets: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Count the neighbors found in interleaved rows.
+
+        Args:
+            offsets: First row of every interleaved set of rows
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Partial neighbor counts
+        """
+        partials = [jit_neighbor_counts(x, m, r, start, stride) for start in offsets]
+        return tuple(np.sum(counts, axis=0) for counts in zip(*partials))
+
+    return run_blocks(_count_rows, list(range(stride)), workers)
+
+
+def _sorted_candidates(x: np.ndarray, n_templates: int, r: float):
+    """Sort templates on their first coordinate and bound their neighborhoods.
+
+    Args:
+        x: Input 1D series
+        n_templates: Number of templates to index
+        r: Tolerance value
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Template indices in sorted order and,
+        for every sorted position, the end of its candidate window
+    """
+    first = x[:n_templates]
+    order = np.argsort(first, kind="stable")
+    keys = first[order]
+    # Widen the window by a few ulps so that float rounding in keys + r can
+    # never drop a true neighbor; candidates are re-checked exactly anyway.
+    scale = float(np.max(np.abs(keys), initial=0.0)) + abs(float(r))
+    slack = 4 * np.finfo(np.float64).eps * scale
+    upper = np.searchsorted(keys, keys + (r + slack), side="right")
+    # A negative r would end windows before their own template.
+    upper = np.maximum(upper, np.arange(1, n_templates + 1))
+    return order, upper
+
+
+def select_method(x: np.ndarray, m: int, r: float) -> str:
+    """Pick the cheapest template-matching backend for a series.
+
+    Integer series compared with r <= 1 only match on exact equality and
+    are counted by hashing. Brute-force matching wins on short series and
+    whenever most pairs are close on the first coordinate, and runs in
+    compiled loops when Numba is available; otherwise the sort-and-sweep
+    index skips the bulk of the pairs.
+
+    Args:
+        x: Input 1D series
+        m: Embedding dimension
+        r: Tolerance value
+
+    Returns:
+        str: One of "hashed", "jit", "brute" or "sorted"
+    """
+    if supports_hashing(x, r):
+        return "hashed"
+
+    brute = "jit" if supports_jit(x) else "brute"
+    if len(x) - m + 1 < SORTED_MIN_TEMPLATES:
+        return brute
+    if candidate_ratio(x, m, r) > SORTED_MAX_CANDIDATE_RATIO:
+        return brute
+    return "sorted"
+
+
+def candidate_ratio(x: np.ndarray, m: int, r: float) -> float:
+    """Measure the fraction of template pairs the sorted index compares.
+
+    Args:
+        x: Input 1D series
+        m: Embedding dimension
+        r: Tolerance value
+
+    Returns:
+        float: Candidate pairs, whose first coordinates are within r,
+        divided by all template pairs
+    """
+    n_templates = len(x) - m + 1
+    if n_templates < 2:
+        return 0.0
+    order, upper = _sorted_candidates(x, n_templates, r)
+    candidates = np.sum(upper - np.arange(1, n_templates + 1))
+    return float(candidates) / (n_templates * (n_templates - 1) / 2)
+
+
+def sorted_neighbor_counts(
+    x: np.ndarray,
+    m: int,
+    r: float,
+    max_pairs: int = DEFAULT_MAX_PAIRS,
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count template neighbors at dimensions m and m + 1 with a sorted index.
+
+    Under the Chebyshev metric two templates can only match if their first
+    samples are closer than r. Templates are sorted on that coordinate and
+    each one is swept against the following templates inside the r-window,
+    which costs O(N log N) plus the number of such candidate pairs instead
+    of O(N^2). Candidates are verified on the remaining coordinates in
+    batches of at most max_pairs pairs. Self-matches are excluded.
+
+    Args:
+        x: Input 1D series
+        m: Embedding dimension
+        r: Tolerance value, pairs with distance strictly below r match
+        max_pairs: Maximum number of candidate pairs verified at once
+        workers: Number of threads sharing the candidate batches
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Neighbor counts of the len(x) - m + 1
+        templates of dimension m and of the len(x) - m templates of
+        dimension m + 1
+    """
+    if max_pairs < 1:
+        raise ValueError("max_pairs must be a positive integer")
+
+    n_m = len(x) - m + 1
+    n_m1 = n_m - 1
+    if not 0 < r:
+        return np.zeros(n_m, dtype=np.int64), np.zeros(max(n_m1, 0), dtype=np.int64)
+
+    order, upper = _sorted_candidates(x, n_m, r)
+    widths = upper - np.arange(1, n_m + 1)
+    ends = np.cumsum(widths)
+
+    batches = []
+    p0 = 0
+    while p0 < n_m:
+        done = ends[p0 - 1] if p0 > 0 else 0
+        p1 = max(int(np.searchsorted(ends, done + max_pairs, side="right")), p0 + 1)
+        batches.append((p0, p1))
+        p0 = p1
+
+    def _count_batches(bounds: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Verify the candidate pairs of the given batches.
+
+        Args:
+            bounds: Range of sorted positions covered by every batch
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Partial neighbor counts
+        """
+        counts_m = np.zeros(n_m, dtype=np.int64)
+        counts_m1 = np.zeros(max(n_m1, 0), dtype=np.int64)
+
+        for p0, p1 in bounds:
+            reps = widths[p0:p1]
+            total = int(np.sum(reps))
+            if total == 0:
+                continue
+            left = np.repeat(np.arange(p0, p1), reps)
+            offsets = np.arange(total) - np.repeat(np.cumsum(reps) - reps, reps)
+            i = order[left]
+            j = order[left + 1 + offsets]
+            for k in range(m):
+                close = np.abs(widen(x[i + k]) - widen(x[j + k])) < r
+                i = i[close]
+                j = j[close]
+            counts_m += np.bincount(i, minlength=n_m)
+            counts_m += np.bincount(j, minlength=n_m)
+
+            inside = (i < n_m1) & (j < n_m1)
+            i = i[inside]
+            j = j[inside]
+            close = np.abs(widen(x[i + m]) - widen(x[j + m])) < r
+            counts_m1 += np.bincount(i[close], minlength=n_m1)
+            counts_m1 += np.bincount(j[close], minlength=n_m1)
+
+        return counts_m, counts_m1
+
+    return run_blocks(_count_batches, batches, workers)
+
+
+def sampled_matches(
+    x: np.ndarray, m: int, r: float, rng: np.random.Generator, n_pairs: int
+) -> Tuple[int, int]:
+    """Draw random template pairs and count their matches.
+
+    Pairs of distinct templates are drawn uniformly among the len(x) - m
+    templates for which both dimension m and m + 1 are defined.
+
+    Args:
+        x: Input 1D series
+        m: Embedding dimension
+        r: Tolerance value, pairs with distance strictly below r match
+        rng: Random generator to draw the pairs from
+        n_pairs: Number of pairs to draw
+
+    Returns:
+        Tuple[int, int]: Number of pairs matching at dimension m and, among
+        them, the number also matching at dimension m + 1
+    """
+    n_templates = len(x) - m
+    i = rng.integers(0, n_templates, size=n_pairs)
+    j = rng.integers(0, n_templates - 1, size=n_pairs)
+    j += j >= i
+
+    for k in range(m):
+        close = np.abs(widen(x[i + k]) - widen(x[j + k])) < r
+        i = i[close]
+        j = j[close]
+    extended = np.abs(widen(x[i + m]) - widen(x[j + m])) < r
+    return len(i), int(np.count_nonzero(extended))
+
+
+def supports_hashing(x: np.ndarray, r: float) -> bool:
+    """Check whether template matching reduces to exact equality.
+
+    Args:
+        x: Input 1D series
+        r: Tolerance value
+
+    Returns:
+        bool: True for integer series with r <= 1
+    """
+    return x.dtype.kind in "iub" and r <= 1
+
+
+def _densify(keys: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Relabel keys with consecutive integers starting at zero.
+
+    Args:
+        keys: Integer keys
+
+    Returns:
+        Tuple[np.ndarray, int]: Dense keys and the number of distinct keys
+    """
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return inverse.ravel().astype(np.int64), len(unique)
+
+
+def hashed_neighbor_counts(
+    x: np.ndarray, m: int, r: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count template neighbors at dimensions m and m + 1 by exact hashing.
+
+    For integer series and 0 < r <= 1 two templates match exactly when they
+    are equal. Every template is turned into an integer key by a rolling
+    base-K hash over the alphabet of K distinct values, and neighbors are
+    counted per key with np.bincount in linear time instead of comparing
+    all pairs. Keys are relabelled whenever the hash space outgrows a small
+    multiple of the series length, so histograms stay O(N) whatever the
+    alphabet size. Self-matches are excluded.
+
+    Args:
+        x: Input 1D integer series
+        m: Embedding dimension
+        r: Tolerance value, must not exceed 1
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Neighbor counts of the len(x) - m + 1
+        templates of dimension m and of the len(x) - m templates of
+        dimension m + 1
+
+    Raises:
+        ValueError: If the series is not integer-valued or r exceeds 1
+    """
+    if not supports_hashing(x, r):
+        raise ValueError("Hashed matching requires integer data and r <= 1")
+
+    n_m = len(x) - m + 1
+    if not 0 < r:
+        return np.zeros(n_m, dtype=np.int64), np.zeros(max(n_m - 1, 0), dtype=np.int64)
+
+    codes, alphabet = _densify(x)
+    keys, n_keys = codes, alphabet
+    max_keys = 4 * len(x) + alphabet
+
+    per_dim = []
+    for dim in range(1, m + 2):
+        if dim > 1:
+            keys = keys[:-1] * alphabet + codes[dim - 1 :]
+            n_keys = n_keys * alphabet
+            if n_keys > max_keys:
+                keys, n_keys = _densify(keys)
+        if dim >= m:
+            per_dim.append(np.bincount(keys, minlength=n_keys)[keys] - 1)
+
+    return per_dim[0], per_dim[1]
+
+
+def sweep_neighbor_counts(
+    x: np.ndarray,
+    m: int,
+    r_values: np.ndarray,
+    tile_size: int = DEFAULT_TILE_SIZE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count template neighbors at dimensions m and m + 1 for a grid of r.
+
+    Pairwise Chebyshev distances are computed once, tile by tile over the
+    upper triangle, and binned against the sorted grid: a distance matches
+    every r above it, so a cumulative sum over the per-row histograms gives
+    the neighbor counts of every template for every r at once. The
+    (m + 1)-dimensional distances are derived from the m-dimensional ones.
+    Self-matches are excluded.
+
+    Args:
+        x: Input 1D series
+        m: Embedding dimension
+        r_values: Sorted grid of tolerance values
+        tile_size: Edge length of the distance tiles
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Neighbor counts of shape
+        (len(x) - m + 1, len(r_values)) at dimension m and of shape
+        (len(x) - m, len(r_values)) at dimension m + 1
+    """
+    if tile_size < 1:
+        raise ValueError("tile_size must be a positive integer")
+
+    embedded = embed(x, m)
+    n_m = embedded.shape[0]
+    n_m1 = max(n_m - 1, 0)
+    n_r = len(r_values)
+    counts_m = np.zeros((n_m, n_r), dtype=np.int64)
+    counts_m1 = np.zeros((n_m1, n_r), dtype=np.int64)
+
+    def _histogram(lines: np.ndarray, bins: np.ndarray, n_lines: int) -> np.ndarray:
+        """Turn the grid bins of matched pairs into cumulative match counts.
+
+        Args:
+            lines: Row (or column) offset of every pair within the tile
+            bins: Number of grid values at or below the distance of every pair
+            n_lines: Number of rows (or columns) of the tile
+
+        Returns:
+            np.ndarray: Match counts of every line for every grid value
+        """
+        flat = lines * (n_r + 1) + bins
+        histogram = np.bincount(flat, minlength=n_lines * (n_r + 1))
+        return np.cumsum(histogram.reshape(n_lines, n_r + 1), axis=1)[:, :n_r]
+
+    r_max = r_values[-1] if n_r > 0 else -np.inf
+    for i0 in range(0, n_m, tile_size):
+        i1 = min(i0 + tile_size, n_m)
+        for j0 in range(i0, n_m, tile_size):
+            j1 = min(j0 + tile_size, n_m)
+            dist = chebyshev_block(embedded, i0, i1, j0, j1)
+            # Pairs at or beyond the largest tolerance never match.
+            matched = dist < r_max
+            if i0 == j0:
+                np.fill_diagonal(matched, False)
+            rows, cols = np.nonzero(matched)
+            bins = np.searchsorted(r_values, dist[rows, cols], side="right")
+
+            inside = (rows + i0 < n_m1) & (cols + j0 < n_m1)
+            rows_m1, cols_m1 = rows[inside], cols[inside]
+            gap = widen(x[rows_m1 + i0 + m]) - widen(x[cols_m1 + j0 + m])
+            dist_m1 = np.maximum(dist[rows_m1, cols_m1], np.abs(gap))
+            bins_m1 = np.searchsorted(r_values, dist_m1, side="right")
+
+            sub_rows = max(min(i1, n_m1) - i0, 0)
+            sub_cols = max(min(j1, n_m1) - j0, 0)
+            counts_m[i0:i1] += _histogram(rows, bins, i1 - i0)
+            counts_m1[i0 : i0 + sub_rows] += _histogram(rows_m1, bins_m1, sub_rows)
+
+            # Diagonal tiles are symmetric and their row sums already hold
+            # every pair. A tile above the diagonal also accounts for its
+            # mirror image below it, credited through the column sums.
+            if i0 != j0:
+                counts_m[j0:j1] += _histogram(cols, bins, j1 - j0)
+                counts_m1[j0 : j0 + sub_cols] += _histogram(cols_m1, bins_m1, sub_cols)
+
+    return counts_m, counts_m1
+
+
+def dimension_neighbor_counts(
+    x: np.ndarray, max_dim: int, r: float, tile_size: int = DEFAULT_TILE_SIZE
+) -> List[np.ndarray]:
+    """Count template neighbors at every dimension from 1 to max_dim.
+
+    A pair of templates matching at dimension d + 1 must already match at
+    dimension d, so the matching pairs of every tile are found once at
+    dimension 1 and then extended one coordinate at a time, dropping a
+    pair as soon as its new coordinate is not within r. Self-matches are
+    excluded.
+
+    Args:
+        x: Input 1D series
+        max_dim: Largest embedding dimension
+        r: Tolerance value, pairs with distance strictly below r match
+        tile_size: Edge length of the distance tiles
+
+    Returns:
+        List[np.ndarray]: Neighbor counts of the len(x) - d + 1 templates of
+        dimension d, for d = 1..max_dim
+    """
+    if tile_size < 1:
+        raise ValueError("tile_size must be a positive integer")
+    if max_dim < 1:
+        raise ValueError("max_dim must be a positive integer")
+
+    N = len(x)
+    sizes = [max(N - d + 1, 0) for d in range(1, max_dim + 1)]
+    counts = [np.zeros(size, dtype=np.int64) for size in sizes]
+
+    for i0 in range(0, N, tile_size):
+        i1 = min(i0 + tile_size, N)
+        rows_x = widen(x[i0:i1])
+        for j0 in range(i0, N, tile_size):
+            j1 = min(j0 + tile_size, N)
+            matched = np.abs(rows_x[:, None] - widen(x[None, j0:j1])) < r
+            if i0 == j0:
+                matched = np.triu(matched, k=1)
+            rows, cols = np.nonzero(matched)
+            rows += i0
+            cols += j0
+
+            for d, size in enumerate(sizes):
+                if d > 0:
+                    # Templates i < j exist at dimension d + 1 while j < size.
+                    alive = cols < size
+                    rows, cols = rows[alive], cols[alive]
+                    gap = widen(x[rows + d]) - widen(x[cols + d])
+                    alive = np.abs(gap) < r
+                    rows, cols = rows[alive], cols[alive]
+                if rows.size == 0:
+                    break
+                # Tiles are credited through offsets so that every bincount
+                # stays within the tile instead of spanning the series.
+                rows_end = max(min(i1, size) - i0, 0)
+                cols_end = max(min(j1, size) - j0, 0)
+                counts[d][i0 : i0 + rows_end] += np.bincount(
+                    rows - i0, minlength=rows_end
+                )
+                counts[d][j0 : j0 + cols_end] += np.bincount(
+                    cols - j0, minlength=cols_end
+                )
+
+    return counts
+
+
+def entropy_from_counts(counts: np.ndarray, base: float = 2) -> float:
+    """Calculate the entropy of a discrete distribution given by counts.
+
+    Args:
+        counts: Occurrence count of every symbol, zeros are ignored
+        base: Base for logarithm calculation, defaults to 2
+
+    Returns:
+        float: Entropy of the empirical distribution
+    """
+    counts = counts[counts > 0]
+    probabilities = counts / np.sum(counts)
+    if base == 2:
+        return float(-np.dot(probabilities, np.log2(probabilities)))
+    return float(-np.dot(probabilities, np.log(probabilities)) / np.log(base))
+
+
+def merge_counts(
+    keys: List[np.ndarray], counts: List[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge partial (key, count) histograms computed over separate chunks.
+
+    Args:
+        keys: Distinct keys of every partial histogram
+        counts: Counts matching the keys of every partial histogram
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Sorted distinct keys and their total counts
+    """
+    merged, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    totals = np.zeros(len(merged), dtype=np.int64)
+    np.add.at(totals, inverse.ravel(), np.concatenate(counts))
+    return merged, totals
+
+
+def symbol_counts(data: Any, chunk_size: int = DEFAULT_CHUNK_SIZE << 4) -> np.ndarray:
+    """Count occurrences of every distinct symbol in the data.
+
+    Small non-negative integers, such as ordinal or binary encodings, are
+    counted in O(N) with np.bincount. Any other input falls back to the
+    sort-based np.unique. Long inputs, including memory-mapped ones, are
+    counted chunk_size symbols at a time and the partial counts merged.
+
+    Args:
+        data: Input symbols
+        chunk_size: Number of symbols counted at once
+
+    Returns:
+        np.ndarray: Occurrence counts, possibly including zeros
+    """
+    data = as_series(data)
+    if data.dtype.kind in "iub" and data.size > 0:
+        low, high = data.min(), data.max()
+        if low >= 0 and high < max(2 * data.size, MIN_BINCOUNT_SYMBOLS):
+            counts = np.zeros(int(high) + 1, dtype=np.int64)
+            for start in range(0, data.size, chunk_size):
+                chunk = data[start : start + chunk_size].astype(np.intp, copy=False)
+                counts += np.bincount(chunk, minlength=len(counts))
+            return counts
+
+    if data.size <= chunk_size:
+        return np.unique(data, return_counts=True)[1]
+
+    keys, counts = [], []
+    for start in range(0, data.size, chunk_size):
+        chunk_keys, chunk_counts = np.unique(
+            data[start : start + chunk_size], return_counts=True
+        )
+        keys.append(chunk_keys)
+        counts.append(chunk_counts)
+    return merge_counts(keys, counts)[1]
+
+
+def batch_segments(
+    data: np.ndarray, axis: Optional[int] = None, offsets: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, Tuple[int, ...]]:
+    """Flatten a batch of series into one array plus segment boundaries.
+
+    A batch is either an N-dimensional array whose series run along axis,
+    or a flat array of concatenated series delimited by offsets, where
+    series k spans data[offsets[k]:offsets[k + 1]].
+
+    Args:
+        data: Batch of series
+        axis: Axis along which the series of an array batch run
+        offsets: Boundaries of the series of a ragged batch
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, Tuple[int, ...]]: Concatenated series,
+        offsets of every series and the shape of the batch result
+
+    Raises:
+        ValueError: If both or invalid batch descriptions are given
+    """
+    data = np.asarray(data)
+    if offsets is not None:
+        if axis is not None:
+            raise ValueError("axis and offsets cannot be combined")
+        data = data.ravel()
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if (
+            offsets.ndim != 1
+            or len(offsets) < 1
+            or offsets[0] != 0
+            or offsets[-1] != len(data)
+            or np.any(np.diff(offsets) < 0)
+        ):
+            raise ValueError(
+                "offsets must be non-decreasing, start at 0 and end at len(data)"
+            )
+        return data, offsets, (len(offsets) - 1,)
+
+    series = np.moveaxis(data, axis, -1)
+    length = series.shape[-1]
+    n_series = int(np.prod(series.shape[:-1], dtype=np.int64))
+    offsets = np.arange(n_series + 1, dtype=np.int64) * length
+    return series.reshape(-1), offsets, series.shape[:-1]
+
+
+def segment_entropy(
+    symbols: np.ndarray, segments: np.ndarray, n_segments: int, base: float = 2
+) -> np.ndarray:
+    """Calculate the entropy of many symbol sequences at once.
+
+    Every (segment, symbol) pair is mapped to one integer key and all keys
+    are counted in a single pass, after which the per-segment entropies are
+    reduced with weighted np.bincount calls.
+
+    Args:
+        symbols: Symbols of all sequences
+        segments: Sequence index of every symbol
+        n_segments: Number of sequences
+        base: Base for logarithm calculation, defaults to 2
+
+    Returns:
+        np.ndarray: float64 entropy of every sequence, zero for empty ones
+    """
+    codes = np.unique(symbols, return_inverse=True)[1].ravel().astype(np.int64)
+    alphabet = int(codes.max(initial=-1)) + 1
+    keys, counts = np.unique(segments * alphabet + codes, return_counts=True)
+    owner = keys // max(alphabet, 1)
+
+    totals = np.bincount(segments, minlength=n_segments)
+    probabilities = counts / totals[owner]
+    log = np.log2(probabilities) if base == 2 else np.log(probabilities) / np.log(base)
+    # np.bincount counts rather than sums when every sequence is empty.
+    entropy = -np.bincount(owner, weights=probabilities * log, minlength=n_segments)
+    return entropy.astype(np.float64, copy=False)
+
+
+def rolling_entropy(symbols: np.ndarray, window: int, base: float = 2) -> np.ndarray:
+    """Calculate the entropy of every window of symbols sliding by one.
+
+    The window histogram is updated incrementally as one symbol leaves and
+    one enters, and so is the sum of n * log(n) over the histogram, from
+    which the entropy of a window of W symbols is log(W) - sum / W. The
+    counts involved in every update are derived at once from per-symbol
+    occurrence ranks, so the whole profile costs O(N log N) regardless of
+    the window length.
+
+    Args:
+        symbols: Input symbols
+        window: Number of symbols per window
+        base: Base for logarithm calculation, defaults to 2
+
+    Returns:
+        np.ndarray: Entropy of the len(symbols) - window + 1 windows
+
+    Raises:
+        ValueError: If the window is empty or longer than the input
+    """
+    symbols = np.asarray(symbols).ravel()
+    n = len(symbols)
+    if not 1 <= window <= n:
+        raise ValueError("window must be between 1 and the length of the data")
+
+    codes = np.unique(symbols, return_inverse=True)[1].ravel().astype(np.int64)
+    positions = np.arange(n, dtype=np.int64)
+    # Sorting (symbol, position) keys groups the occurrences of every symbol
+    # in order, so a key's offset within its group is its occurrence rank.
+    keys = np.sort(codes * (n + 1) + positions)
+    group_start = np.searchsorted(keys, np.arange(codes.max() + 1) * (n + 1))
+    rank = np.empty(n, dtype=np.int64)
+    rank[keys % (n + 1)] = np.arange(n) - group_start[keys // (n + 1)]
+
+    def occurrences_before(code: np.ndarray, position: np.ndarray) -> np.ndarray:
+        """Count occurrences of each code strictly before a position.
+
+        Args:
+            code: Symbol codes
+            position: Positions to count up to
+
+        Returns:
+            np.ndarray: Number of earlier occurrences of every code
+        """
+        return np.searchsorted(keys, code * (n + 1) + position) - group_start[code]
+
+    log = np.log2 if base == 2 else lambda v: np.log(v) / np.log(base)
+    table = np.zeros(window + 2)
+    table[1:] = np.arange(1, window + 2) * log(np.arange(1, window + 2))
+
+    first = np.bincount(codes[:window])
+    start = np.dot(first[first > 0], log(first[first > 0]))
+
+    leaving = codes[: n - window]
+    entering = codes[window:]
+    count_leaving = occurrences_before(leaving, positions[window:]) - rank[: n - window]
+    count_entering = rank[window:] - occurrences_before(
+        entering, positions[: n - window]
+    )
+    delta = (
+        table[count_leaving - 1]
+        - table[count_leaving]
+        + table[count_entering + 1]
+        - table[count_entering]
+    )
+    delta[leaving == entering] = 0.0
+
+    sums = np.concatenate([[start], start + np.cumsum(delta)])
+    return np.maximum(log(window) - sums / window, 0.0)
+
+
+def lehmer_codes(permutations: np.ndarray) -> np.ndarray:
+    """Map permutations to their Lehmer codes.
+
+    Args:
+        permutations: Array of shape (n, order) holding one permutation per row
+
+    Returns:
+        np.ndarray: Unique integer in [0, order!) for every permutation
+
+    Raises:
+        ValueError: If the order exceeds MAX_ORDER
+    """
+    order = permutations.shape[1]
+    check_order(order)
+    codes = np.zeros(permutations.shape[0], dtype=np.int64)
+    for k in range(order - 1):
+        smaller = permutations[:, k + 1 :] < permutations[:, k : k + 1]
+        codes += np.count_nonzero(smaller, axis=1) * factorial(order - 1 - k)
+    return codes
+
+
+def check_order(order: int) -> None:
+    """Check that the ordinal patterns of an order can be encoded.
+
+    Args:
+        order: Permutation order
+
+    Raises:
+        ValueError: If the order exceeds MAX_ORDER, whose Lehmer codes
+            would overflow int64
+    """
+    if order > MAX_ORDER:
+        raise ValueError(f"Permutation order must be at most {MAX_ORDER}, got {order}")
+
+
+def iter_ordinal_patterns(
+    x: np.ndarray, order: int, delay: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """Encode the ordinal pattern of every delayed window as an integer.
+
+    All windows are taken as one strided view and argsorted along their last
+    axis. Each resulting permutation is mapped to its Lehmer code, a unique
+    integer in [0, order!), so patterns can be counted with np.bincount.
+    Windows are processed chunk_size at a time, so only one chunk of codes
+    is held in memory. When Numba is available, windows are encoded in
+    compiled loops and only those containing ties are sorted, so that ties
+    resolve identically.
+
+    Args:
+        x: Input 1D series
+        order: Permutation order
+        delay: Time delay between samples of a window
+        chunk_size: Number of windows encoded at once
+
+    Yields:
+        np.ndarray: Lehmer codes of the next chunk of windows
+
+    Raises:
+        ValueError: If the order exceeds MAX_ORDER
+    """
+    check_order(order)
+    span = delay * (order - 1) + 1
+    if len(x) < span:
+        return
+
+    windows = sliding_window_view(x, span)[:, ::delay]
+    compiled = JIT_AVAILABLE and x.dtype.kind in "iuf" and order <= MAX_JIT_ORDER
+
+    for start in range(0, windows.shape[0], chunk_size):
+        stop = min(start + chunk_size, windows.shape[0])
+        if compiled:
+            block = x[start : stop + span - 1]
+            block = (
+                block.astype(np.float64) if block.dtype.kind == "f" else widen(block)
+            )
+            codes, tied = jit_ordinal_patterns(block, order, delay)
+            tied = np.flatnonzero(tied)
+            if len(tied) > 0:
+                permutations = np.argsort(windows[start + tied], axis=1)
+                codes[tied] = lehmer_codes(permutations)
+        else:
+            codes = lehmer_codes(np.argsort(windows[start:stop], axis=1))
+        yield codes
+
+
+def ordinal_patterns(
+    x: np.ndarray, order: int, delay: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> np.ndarray:
+    """Encode the ordinal patterns of all delayed windows at once.
+
+    Args:
+        x: Input 1D series
+        order: Permutation order
+        delay: Time delay between samples of a window
+        chunk_size: Number of windows encoded at once
+
+    Returns:
+        np.ndarray: Lehmer code of the ordinal pattern of every window
+    """
+    chunks = list(iter_ordinal_patterns(x, order, delay, chunk_size))
+    if not chunks:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(chunks)
+
+
+def ordinal_pattern_counts(
+    x: np.ndarray, order: int, delay: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> np.ndarray:
+    """Count the ordinal patterns of a series chunk by chunk.
+
+    Args:
+        x: Input 1D series
+        order: Permutation order
+        delay: Time delay between samples of a window
+        chunk_size: Number of windows encoded at once
+
+    Returns:
+        np.ndarray: Count of every observed pattern
+    """
+    n_patterns = factorial(order)
+    if n_patterns <= MAX_BINCOUNT_PATTERNS:
+        counts = np.zeros(n_patterns, dtype=np.int64)
+        for codes in iter_ordinal_patterns(x, order, delay, chunk_size):
+            counts += np.bincount(codes, minlength=n_patterns)
+        return counts
+
+    keys, counts = [], []
+    for codes in iter_ordinal_patterns(x, order, delay, chunk_size):
+        chunk_keys, chunk_counts = np.unique(codes, return_counts=True)
+        keys.append(chunk_keys)
+        counts.append(chunk_counts)
+    if not keys:
+        return np.zeros(0, dtype=np.int64)
+    return merge_counts(keys, counts)[1]
+
+
+def series_std(
+    x: np.ndarray, ddof: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE << 4
+) -> float:
+    """Calculate the standard deviation of a series.
+
+    Series that fit in a single chunk use np.std. Longer ones, typically
+    memory-mapped, are reduced in two chunked passes so that no temporary
+    of the full length is created.
+
+    Args:
+        x: Input 1D series
+        ddof: Delta degrees of freedom
+        chunk_size: Number of samples reduced at once
+
+    Returns:
+        float: Standard deviation of the series
+    """
+    if len(x) <= chunk_size:
+        return np.std(x, ddof=ddof)
+
+    total = 0.0
+    for start in range(0, len(x), chunk_size):
+        total += np.sum(x[start : start + chunk_size], dtype=np.float64)
+    mean = total / len(x)
+
+    squares = 0.0
+    for start in range(0, len(x), chunk_size):
+        deviations = x[start : start + chunk_size].astype(np.float64) - mean
+        squares += np.dot(deviations, deviations)
+    return np.sqrt(squares / (len(x) - ddof))
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from enum import Enum
-from typing import List
+from typing import List, Optional, Union
 
 
 class AlgorithmType(str, Enum):
@@ -15,6 +15,37 @@ class EntropyResult(BaseModel):
     encoding: str
     algorithm: str
     entropy: float
+    method: Optional[str] = None
+    length: Optional[int] = None
+
+
+class CostEstimate(BaseModel):
+    method: str
+    length: int
+    seconds: float
+    memory: int
+    tile_size: Optional[int] = None
+    max_pairs: Optional[int] = None
+
+
+class SampledEntropy(BaseModel):
+    entropy: float
+    ci_low: float
+    ci_high: float
+    confidence: float
+    seed: int
+    pairs: int
+    matches: int
+    extended_matches: int
+
+
+class SweepResult(BaseModel):
+    parameter: str
+    values: List[Union[int, float]]
+    sample_entropy: List[float]
+    approximate_entropy: List[float]
+    matches: List[int]
+    extended_matches: List[int]
 
 
 class EntropyResponse(BaseModel):
@@ -7,6 +7,7 @@ from .version import Version
 from .chaos_encoder import ChaosEncoder, EncodingModel
 from .algorithms import Algorithms
 from .models import EntropyResult, EntropyResponse, AlgorithmType
+from .planner import ALGORITHM_INTERMEDIATES, ComputationPlan, Intermediates
 from typing import List, Union, Optional
 import numpy as np
 
@@ -24,29 +25,14 @@ class Order:
             AlgorithmType.PERMUTATION,
         }
 
-    def _get_algorithm_function(self, algorithm: AlgorithmType):
-        """Get the corresponding algorithm function with parameters.
-
-        Args:
-            algorithm: Algorithm type to get the function for
-
-        Returns:
-            Callable: Algorithm function with parameters set
-        """
-        algorithm_map = {
-            AlgorithmType.SHANNON: self.algorithms.shannon_entropy,
-            AlgorithmType.APPROXIMATE: lambda x: self.algorithms.approximate_entropy(
-                x, m=2, r=0.2 * float(x.std())
-            ),
-            AlgorithmType.SAMPLE: lambda x: self.algorithms.sample_entropy(
-                x, m=2, r=0.2 * float(x.std())
-            ),
-            AlgorithmType.PERMUTATION: self.algorithms.permutation_entropy,
-        }
-        return algorithm_map.get(algorithm)
-
     def _calculate_entropy(
-        self, data: np.ndarray, encoding: str, algorithm: AlgorithmType
+        self,
+        data: np.ndarray,
+        encoding: str,
+        algorithm: AlgorithmType,
+        time_budget: Optional[float] = None,
+        plan: Optional[ComputationPlan] = None,
+        shared: Optional[Intermediates] = None,
     ) -> EntropyResult:
         """Calculate entropy for given data using specified encoding and algorithm.
 
@@ -54,21 +40,33 @@ class Order:
             data: Encoded data
             encoding: Name of the encoding used
             algorithm: Algorithm to calculate entropy
+            time_budget: Latency budget in seconds for sampled estimators
+            plan: Computation plan covering the algorithm, built for the
+                algorithm alone if not given
+            shared: Intermediates already computed for the data
 
         Returns:
             EntropyResult: Result containing encoding, algorithm and entropy value
         """
-        algo_func = self._get_algorithm_function(algorithm)
-        if algo_func is None:
+        if algorithm not in ALGORITHM_INTERMEDIATES:
             raise ValueError(f"Unsupported algorithm type: {algorithm}")
+        if plan is None:
+            plan = ComputationPlan([algorithm], time_budget)
+        if shared is None:
+            shared = plan.prepare(data, self.algorithms)
+        choice = shared.choices.get(algorithm)
 
         try:
-            entropy = algo_func(data)
+            entropy = plan.evaluate(algorithm, shared)
             if not np.isfinite(entropy):
                 raise ValueError("Calculated entropy is not finite")
 
             return EntropyResult(
-                encoding=encoding, algorithm=algorithm.value, entropy=float(entropy)
+                encoding=encoding,
+                algorithm=algorithm.value,
+                entropy=float(entropy),
+                method=choice.method if choice is not None else None,
+                length=choice.length if choice is not None else None,
             )
         except Exception as e:
             raise ValueError(f"Error calculating entropy with {algorithm}: {str(e)}")
@@ -79,14 +77,28 @@ class Order:
         encodings: Optional[List[EncodingModel]] = None,
         algorithms: Optional[List[AlgorithmType]] = None,
         json_response: bool = False,
+        time_budget: Optional[float] = None,
+        memory_budget: Optional[int] = None,
+        over_budget: str = "downsample",
     ) -> Union[EntropyResponse, List[EntropyResult]]:
         """Get entropy analysis report for the given text data.
 
+        Each algorithm is evaluated with the most accurate method whose
+        modelled cost fits the budgets: exact template matching, then the
+        sorted index, then sampled template pairs for sample entropy.
+
         Args:
             data: Input text data to analyze
             encodings: List of encoding models to use (default: all)
             algorithms: List of algorithms to use (default: all)
             json_response: Whether to return response as JSON
+            time_budget: Time budget in seconds per algorithm evaluation
+                (default: unlimited)
+            memory_budget: Working memory budget in bytes per encoding and
+                per algorithm evaluation (default: unlimited)
+            over_budget: "downsample" to analyze the longest prefix that
+                fits the budgets, or "refuse" to raise an error, when even
+                the cheapest method exceeds them (default: "downsample")
 
         Returns:
             Union[EntropyResponse, List[EntropyResult]]: Entropy analysis results
@@ -121,16 +133,26 @@ class Order:
             if invalid_algos:
                 raise ValueError(f"Unsupported algorithm types: {invalid_algos}")
 
+        # The plan is shared by every encoding, which reuse the code points
+        # of the text, and the intermediates it lists are computed once per
+        # encoded series for all algorithms.
+        plan = ComputationPlan(algorithms, time_budget, memory_budget, over_budget)
         results = []
         for encoding_model in encodings:
             try:
-                encoded_data = self.encoder.encode(data, encoding_model)
+                encoded_data = plan.encode(self.encoder, data, encoding_model)
                 if encoded_data is None or len(encoded_data) == 0:
                     raise ValueError(f"Encoding failed for model {encoding_model}")
 
+                shared = plan.prepare(encoded_data, self.algorithms)
                 for algorithm in algorithms:
                     result = self._calculate_entropy(
-                        encoded_data, encoding_model.value, algorithm
+                        encoded_data,
+                        encoding_model.value,
+                        algorithm,
+                        time_budget,
+                        plan,
+                        shared,
                     )
                     results.append(result)
             except Exception as e:
@@ -0,0 +1,949 @@
+"""
+Computation planning for entropy reports spanning several algorithms.
+This module resolves the intermediates each algorithm needs into a graph so that shared ones are computed once per series,
+and picks for every algorithm the most accurate method whose modelled cost fits the time and memory budgets.
+"""
+
+import numpy as np
+from math import ceil, isqrt, log2
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from .algorithms import Algorithms
+from .jit import JIT_AVAILABLE, supports_jit
+from .kernels import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_PAIRS,
+    DEFAULT_SAMPLED_PAIRS,
+    DEFAULT_TILE_SIZE,
+    SORTED_MAX_CANDIDATE_RATIO,
+    as_series,
+    candidate_ratio,
+    ordinal_pattern_counts,
+    series_std,
+    symbol_counts,
+)
+from .chaos_encoder import ChaosEncoder
+from .models import AlgorithmType, CostEstimate, EncodingModel
+from .representations import (
+    BINARY_REPRESENTATIONS,
+    MAX_PLANE_KEY_BITS,
+    PackedBits,
+    SparseOneHot,
+)
+
+DEFAULT_M = 2
+DEFAULT_R_FACTOR = 0.2
+DEFAULT_ORDER = 3
+
+# Single-core throughput of the kernels, used to turn operation counts
+# into seconds. They are on the conservative side of what they reach.
+SYMBOLS_PER_SECOND = 5e6
+PATTERNS_PER_SECOND = 4e6
+PAIR_COORDINATES_PER_SECOND = 6e7
+JIT_PAIR_COORDINATES_PER_SECOND = 2e8
+SORTED_PAIR_COORDINATES_PER_SECOND = 2.5e7
+SAMPLED_PAIRS_PER_SECOND = 6e6
+# Fixed overhead of every distance tile and candidate batch.
+TILE_SECONDS = 1e-4
+BATCH_SECONDS = 3e-4
+POPCOUNT_BITS_PER_SECOND = 2e9
+PLANE_MASK_BITS_PER_SECOND = 3e9
+
+OVER_BUDGET_POLICIES = ("downsample", "refuse")
+
+# Smallest tiles and batches the matching methods are shrunk to.
+MIN_TILE_SIZE = 32
+MIN_BATCH_PAIRS = 1024
+
+# Bytes every character of the text takes once encoded. One-hot encodings
+# are sparse and hold a single column index per character, and binary
+# encodings are packed and take a byte per byte of the UTF-8 text.
+ENCODED_BYTES_PER_CHARACTER: Dict[EncodingModel, int] = {
+    EncodingModel.ORDINAL: 4,
+    EncodingModel.ONE_HOT: 4,
+    EncodingModel.FREQUENCY: 8,
+    EncodingModel.BINARY: 1,
+}
+
+# Encodings computed from the ordinal code points of the text.
+ORDINAL_ENCODINGS = (
+    EncodingModel.ORDINAL,
+    EncodingModel.ONE_HOT,
+    EncodingModel.FREQUENCY,
+)
+
+# Intermediates and the intermediates they are derived from.
+INTERMEDIATE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "std": (),
+    "tolerance": ("std",),
+    "symbol_counts": (),
+    "ordinal_pattern_counts": (),
+    "neighbor_counts": ("tolerance",),
+}
+
+# Intermediates every algorithm is evaluated from.
+ALGORITHM_INTERMEDIATES: Dict[AlgorithmType, Tuple[str, ...]] = {
+    AlgorithmType.SHANNON: ("symbol_counts",),
+    AlgorithmType.APPROXIMATE: ("tolerance", "neighbor_counts"),
+    AlgorithmType.SAMPLE: ("neighbor_counts",),
+    AlgorithmType.PERMUTATION: ("ordinal_pattern_counts",),
+}
+
+# Intermediate whose length is set by the method chosen for an algorithm.
+ALGORITHM_SOURCES: Dict[AlgorithmType, str] = {
+    AlgorithmType.SHANNON: "symbol_counts",
+    AlgorithmType.APPROXIMATE: "neighbor_counts",
+    AlgorithmType.SAMPLE: "neighbor_counts",
+    AlgorithmType.PERMUTATION: "ordinal_pattern_counts",
+}
+
+# Matching backend behind every template matching method. The exact method
+# is costed as brute force and runs compiled when the series supports it.
+MATCHING_BACKENDS = {"exact": "brute", "indexed": "sorted"}
+
+
+def expansion_factor(text: str, encoding: EncodingModel) -> float:
+    """Get the number of encoded symbols per character of a text.
+
+    Args:
+        text: Input text to encode
+        encoding: Encoding model applied to the text
+
+    Returns:
+        float: Encoded length divided by the text length
+    """
+    if encoding == EncodingModel.ONE_HOT:
+        return float(len(set(text)))
+    if encoding == EncodingModel.BINARY:
+        return 8.0 * utf8_bytes_per_character(text)
+    return 1.0
+
+
+def utf8_bytes_per_character(text: str) -> float:
+    """Get the average number of bytes per character of a text in UTF-8.
+
+    Args:
+        text: Input text
+
+    Returns:
+        float: Length of the UTF-8 encoding divided by the text length
+    """
+    if not text:
+        return 1.0
+    return len(text.encode("utf-8", errors="surrogatepass")) / len(text)
+
+
+def shannon_cost(
+    n: int,
+    m: int,
+    expansion: float = 1.0,
+    ratio: Optional[float] = None,
+    memory_budget: Optional[int] = None,
+) -> List[CostEstimate]:
+    """Model the cost of Shannon entropy.
+
+    Args:
+        n: Input length
+        m: Embedding dimension, unused
+        expansion: Encoded symbols per input element
+        ratio: Candidate ratio of the sorted index, unused
+        memory_budget: Memory budget in bytes, unused
+
+    Returns:
+        List[CostEstimate]: Cost of every method, most accurate first
+    """
+    length = int(n * expansion)
+    return [
+        CostEstimate(
+            method="exact",
+            length=length,
+            seconds=length / SYMBOLS_PER_SECOND,
+            memory=16 * min(length, DEFAULT_CHUNK_SIZE << 4),
+        )
+    ]
+
+
+def permutation_cost(
+    n: int,
+    m: int,
+    expansion: float = 1.0,
+    ratio: Optional[float] = None,
+    memory_budget: Optional[int] = None,
+) -> List[CostEstimate]:
+    """Model the cost of permutation entropy.
+
+    Args:
+        n: Input length
+        m: Embedding dimension, unused
+        expansion: Encoded symbols per input element
+        ratio: Candidate ratio of the sorted index, unused
+        memory_budget: Memory budget in bytes, unused
+
+    Returns:
+        List[CostEstimate]: Cost of every method, most accurate first
+    """
+    length = int(n * expansion)
+    return [
+        CostEstimate(
+            method="exact",
+            length=length,
+            seconds=length / PATTERNS_PER_SECOND,
+            memory=8 * DEFAULT_ORDER * min(length, DEFAULT_CHUNK_SIZE),
+        )
+    ]
+
+
+def approximate_cost(
+    n: int,
+    m: int,
+    expansion: float = 1.0,
+    ratio: Optional[float] = None,
+    memory_budget: Optional[int] = None,
+) -> List[CostEstimate]:
+    """Model the cost of Approximate Entropy.
+
+    Every pair of templates is compared coordinate by coordinate by the
+    brute-force kernel, compiled when Numba is available. The sorted index
+    only compares the candidate pairs whose first coordinates are within r.
+    Distances are held tile by tile and candidates batch by batch, the tiles
+    and batches being shrunk to what is left of the memory budget once the
+    per-sample arrays are allocated, at the price of more kernel calls.
+
+    Args:
+        n: Input length
+        m: Embedding dimension
+        expansion: Encoded symbols per input element
+        ratio: Candidate ratio of the sorted index as measured by
+            candidate_ratio(), defaults to SORTED_MAX_CANDIDATE_RATIO
+        memory_budget: Memory budget in bytes the tiles and batches are
+            sized for, defaults to None for the default sizes
+
+    Returns:
+        List[CostEstimate]: Cost of every method, most accurate first, with
+        the tile size or batch size it runs with
+    """
+    length = int(n * expansion)
+    pairs = length * (length - 1) / 2
+    comparisons = pairs * (m + 1)
+    if ratio is None:
+        ratio = SORTED_MAX_CANDIDATE_RATIO
+    brute_rate = (
+        JIT_PAIR_COORDINATES_PER_SECOND
+        if JIT_AVAILABLE
+        else PAIR_COORDINATES_PER_SECOND
+    )
+
+    tile_size = min(DEFAULT_TILE_SIZE, max(length, 1))
+    if memory_budget is not None:
+        fitting = isqrt(max(memory_budget - 16 * length, 0) // 24)
+        tile_size = max(min(tile_size, fitting), MIN_TILE_SIZE)
+    n_tiles = ceil(length / tile_size) ** 2 / 2
+
+    candidates = pairs * ratio
+    max_pairs = DEFAULT_MAX_PAIRS
+    if memory_budget is not None:
+        fitting = max(memory_budget - 32 * length, 0) // 40
+        max_pairs = max(min(max_pairs, fitting), MIN_BATCH_PAIRS)
+    n_batches = ceil(candidates / max_pairs)
+
+    return [
+        CostEstimate(
+            method="exact",
+            length=length,
+            seconds=comparisons / brute_rate + n_tiles * TILE_SECONDS,
+            memory=24 * tile_size**2 + 16 * length,
+            tile_size=tile_size,
+        ),
+        CostEstimate(
+            method="indexed",
+            length=length,
+            seconds=length * log2(max(length, 2)) / SYMBOLS_PER_SECOND
+            + comparisons * ratio / SORTED_PAIR_COORDINATES_PER_SECOND
+            + n_batches * BATCH_SECONDS,
+            memory=int(40 * min(candidates, max_pairs)) + 32 * length,
+            max_pairs=max_pairs,
+        ),
+    ]
+
+
+def sample_cost(
+    n: int,
+    m: int,
+    expansion: float = 1.0,
+    ratio: Optional[float] = None,
+    memory_budget: Optional[int] = None,
+) -> List[CostEstimate]:
+    """Model the cost of Sample Entropy.
+
+    Exact and indexed matching cost as much as for Approximate Entropy.
+    The sampled estimator draws a fixed number of pairs whatever the length,
+    in batches of at most as many pairs as the series has and as fit the
+    memory budget.
+
+    Args:
+        n: Input length
+        m: Embedding dimension
+        expansion: Encoded symbols per input element
+        ratio: Candidate ratio of the sorted index
+        memory_budget: Memory budget in bytes the tiles and batches are
+            sized for
+
+    Returns:
+        List[CostEstimate]: Cost of every method, most accurate first, with
+        the tile size or batch size it runs with
+    """
+    length = int(n * expansion)
+    batch_size = max(min(length * (length - 1), DEFAULT_MAX_PAIRS), 1)
+    if memory_budget is not None:
+        batch_size = max(min(batch_size, memory_budget // 40), MIN_BATCH_PAIRS)
+    return approximate_cost(n, m, expansion, ratio, memory_budget) + [
+        CostEstimate(
+            method="sampled",
+            length=length,
+            seconds=DEFAULT_SAMPLED_PAIRS / SAMPLED_PAIRS_PER_SECOND
+            + ceil(DEFAULT_SAMPLED_PAIRS / batch_size) * BATCH_SECONDS,
+            memory=40 * batch_size,
+            max_pairs=batch_size,
+        )
+    ]
+
+
+def one_hot_shannon_cost(
+    n: int,
+    m: int,
+    expansion: float = 1.0,
+    ratio: Optional[float] = None,
+    memory_budget: Optional[int] = None,
+) -> List[CostEstimate]:
+    """Model the cost of Shannon entropy on a sparse one-hot series.
+
+    The counts of zeros and ones follow from the shape alone.
+
+    Args:
+        n: Number of characters
+        m: Embedding dimension, unused
+        expansion: Alphabet size
+        ratio: Candidate ratio of the sorted index, unused
+        memory_budget: Memory budget in bytes, unused
+
+    Returns:
+        List[CostEstimate]: Cost of every method, most accurate first
+    """
+    return [
+        CostEstimate(method="exact", length=int(n * expansion), seconds=0, memory=0)
+    ]
+
+
+def one_hot_window_cost(
+    n: int,
+    m: int,
+    expansion: float = 1.0,
+    ratio: Optional[float] = None,
+    memory_budget: Optional[int] = None,
+) -> List[CostEstimate]:
+    """Model the cost of window statistics on a sparse one-hot series.
+
+    Templates and ordinal patterns are counted from the windows holding a
+    one, about m + 1 per character, which are sorted by position and key.
+
+    Args:
+        n: Number of characters
+        m: Embedding dimension
+        expansion: Alphabet size
+        ratio: Candidate ratio of the sorted index, unused
+        memory_budget: Memory budget in bytes, unused
+
+    Returns:
+        List[CostEstimate]: Cost of every method, most accurate first
+    """
+    keys = n * (m + 2)
+    return [
+        CostEstimate(
+            method="exact",
+            length=int(n * expansion),
+            seconds=keys * log2(max(keys, 2)) / SYMBOLS_PER_SECOND,
+            memory=48 * keys,
+        )
+    ]
+
+
+def packed_shannon_cost(
+    n: int,
+    m: int,
+    expansion: float = 1.0,
+    ratio: Optional[float] = None,
+    memory_budget: Optional[int] = None,
+) -> List[CostEstimate]:
+    """Model the cost of Shannon entropy on a packed binary series.
+
+    The ones are counted with popcounts over the packed words.
+
+    Args:
+        n: Number of bits
+        m: Embedding dimension, unused
+        expansion: Encoded symbols per input element, unused
+        ratio: Candidate ratio of the sorted index, unused
+        memory_budget: Memory budget in bytes, unused
+
+    Returns:
+        List[CostEstimate]: Cost of every method, most accurate first
+    """
+    return [
+        CostEstimate(
+            method="exact",
+            length=n,
+            seconds=n / POPCOUNT_BITS_PER_SECOND,
+            memory=min(n // 64, DEFAULT_CHUNK_SIZE << 4),
+        )
+    ]
+
+
+def packed_window_cost(
+    n: int,
+    m: int,
+    expansion: float = 1.0,
+    ratio: Optional[float] = None,
+    memory_budget: Optional[int] = None,
+) -> List[CostEstimate]:
+    """Model the cost of window statistics on a packed binary series.
+
+    Windows of m + 1 samples are counted from bit planes, with about
+    2**(m + 2) word operations over every packed word.
+
+    Args:
+        n: Number of bits
+        m: Embedding dimension
+        expansion: Encoded symbols per input element, unused
+        ratio: Candidate ratio of the sorted index, unused
+        memory_budget: Memory budget in bytes, unused
+
+    Returns:
+        List[CostEstimate]: Cost of every method, most accurate first
+    """
+    masks = 2 ** (min(m, MAX_PLANE_KEY_BITS - 1) + 2)
+    return [
+        CostEstimate(
+            method="exact",
+            length=n,
+            seconds=n * masks / PLANE_MASK_BITS_PER_SECOND,
+            memory=8 * masks * min(n // 64 + 1, DEFAULT_CHUNK_SIZE),
+        )
+    ]
+
+
+COST_MODELS: Dict[AlgorithmType, Callable[..., List[CostEstimate]]] = {
+    AlgorithmType.SHANNON: shannon_cost,
+    AlgorithmType.APPROXIMATE: approximate_cost,
+    AlgorithmType.SAMPLE: sample_cost,
+    AlgorithmType.PERMUTATION: permutation_cost,
+}
+
+ONE_HOT_COST_MODELS: Dict[AlgorithmType, Callable[..., List[CostEstimate]]] = {
+    AlgorithmType.SHANNON: one_hot_shannon_cost,
+    AlgorithmType.APPROXIMATE: one_hot_window_cost,
+    AlgorithmType.SAMPLE: one_hot_window_cost,
+    AlgorithmType.PERMUTATION: one_hot_window_cost,
+}
+
+PACKED_COST_MODELS: Dict[AlgorithmType, Callable[..., List[CostEstimate]]] = {
+    AlgorithmType.SHANNON: packed_shannon_cost,
+    AlgorithmType.APPROXIMATE: packed_window_cost,
+    AlgorithmType.SAMPLE: packed_window_cost,
+    AlgorithmType.PERMUTATION: packed_window_cost,
+}
+
+
+class Intermediates:
+    """Values shared by the algorithms run on one series, each computed once."""
+
+    def __init__(
+        self,
+        data: Any,
+        algorithms: Optional[Algorithms] = None,
+        lengths: Optional[Dict[str, int]] = None,
+        matching_method: str = "auto",
+        tile_size: int = DEFAULT_TILE_SIZE,
+        max_pairs: int = DEFAULT_MAX_PAIRS,
+    ) -> None:
+        """Initialize the intermediates of a series.
+
+        Args:
+            data: Encoded series the algorithms run on
+            algorithms: Algorithms instance computing the template matches
+            lengths: Number of leading samples some intermediates are
+                computed from, defaults to the whole series
+            matching_method: Template matching backend of the neighbor
+                counts, brute force running compiled when the series allows
+            tile_size: Edge length of the distance tiles of brute force
+            max_pairs: Maximum number of candidate pairs per sorted batch
+        """
+        self.series = (
+            data if isinstance(data, BINARY_REPRESENTATIONS) else as_series(data)
+        )
+        self.algorithms = algorithms if algorithms is not None else Algorithms()
+        self.lengths = dict(lengths) if lengths is not None else {}
+        self.matching_method = matching_method
+        self.tile_size = tile_size
+        self.max_pairs = max_pairs
+        self.choices: Dict[AlgorithmType, CostEstimate] = {}
+        self._values: Dict[str, Any] = {}
+        self._builders: Dict[str, Callable[[], Any]] = {
+            "std": self._std,
+            "tolerance": self._tolerance,
+            "symbol_counts": self._symbol_counts,
+            "ordinal_pattern_counts": self._ordinal_pattern_counts,
+            "neighbor_counts": self._neighbor_counts,
+        }
+
+    def get(self, name: str) -> Any:
+        """Get an intermediate, computing it on first use.
+
+        Args:
+            name: Name of the intermediate
+
+        Returns:
+            Any: Value of the intermediate
+
+        Raises:
+            ValueError: If the intermediate is unknown
+        """
+        if name not in self._values:
+            if name not in self._builders:
+                raise ValueError(f"Unknown intermediate: {name}")
+            self._values[name] = self._builders[name]()
+        return self._values[name]
+
+    def source(self, name: str) -> Union[np.ndarray, SparseOneHot, PackedBits]:
+        """Get the leading part of the series an intermediate is computed from.
+
+        Args:
+            name: Name of the intermediate
+
+        Returns:
+            Union[np.ndarray, SparseOneHot, PackedBits]: The series,
+            truncated if the intermediate is downsampled
+        """
+        if name not in self.lengths:
+            return self.series
+        if isinstance(self.series, BINARY_REPRESENTATIONS):
+            return self.series.prefix(self.lengths[name])
+        return self.series[: self.lengths[name]]
+
+    def computed(self) -> List[str]:
+        """List the intermediates computed so far.
+
+        Returns:
+            List[str]: Names of the computed intermediates, in order
+        """
+        return list(self._values)
+
+    def _std(self) -> float:
+        """Standard deviation of the series."""
+        if isinstance(self.series, BINARY_REPRESENTATIONS):
+            return self.series.std()
+        return float(series_std(self.series))
+
+    def _tolerance(self) -> float:
+        """Matching tolerance, a fixed fraction of the standard deviation."""
+        return DEFAULT_R_FACTOR * self.get("std")
+
+    def _symbol_counts(self) -> np.ndarray:
+        """Occurrence counts of the distinct symbols."""
+        x = self.source("symbol_counts")
+        if isinstance(x, BINARY_REPRESENTATIONS):
+            return x.symbol_counts()
+        return symbol_counts(x)
+
+    def _ordinal_pattern_counts(self) -> np.ndarray:
+        """Occurrence counts of the ordinal patterns."""
+        x = self.source("ordinal_pattern_counts")
+        if isinstance(x, BINARY_REPRESENTATIONS):
+            return x.ordinal_pattern_counts(DEFAULT_ORDER)
+        return ordinal_pattern_counts(x, DEFAULT_ORDER)
+
+    def _neighbor_counts(self) -> Tuple[Any, Any]:
+        """Template neighbor counts at dimensions m and m + 1.
+
+        Sparse one-hot and packed binary series matched by key hold the
+        template multiplicities instead, and are densified otherwise. Brute
+        force runs compiled when the series supports it, which is exact in
+        O(N) memory.
+        """
+        x = self.source("neighbor_counts")
+        method = self.matching_method
+        if method == "brute" and not isinstance(x, BINARY_REPRESENTATIONS):
+            if supports_jit(as_series(x)):
+                method = "jit"
+        return self.algorithms.count_neighbors(
+            x,
+            DEFAULT_M,
+            self.get("tolerance"),
+            self.tile_size,
+            method,
+            max_pairs=self.max_pairs,
+        )
+
+
+class ComputationPlan:
+    """Ordered intermediates and methods needed to evaluate a set of algorithms."""
+
+    def __init__(
+        self,
+        algorithms: Sequence[AlgorithmType],
+        time_budget: Optional[float] = None,
+        memory_budget: Optional[int] = None,
+        over_budget: str = "downsample",
+    ) -> None:
+        """Resolve the intermediates of the requested algorithms.
+
+        Args:
+            algorithms: Algorithms to evaluate
+            time_budget: Time budget in seconds per algorithm evaluation
+            memory_budget: Working memory budget in bytes per encoded series
+                and per algorithm evaluation
+            over_budget: What to do when even the cheapest method exceeds a
+                budget, "downsample" to the longest prefix that fits or
+                "refuse" with an error
+
+        Raises:
+            ValueError: If an algorithm has no cost model or the budget
+                policy is unknown
+        """
+        if over_budget not in OVER_BUDGET_POLICIES:
+            raise ValueError(f"Unsupported over-budget policy: {over_budget}")
+        for algorithm in algorithms:
+            if algorithm not in COST_MODELS:
+                raise ValueError(f"Unsupported algorithm type: {algorithm}")
+
+        self.algorithms = list(algorithms)
+        self.time_budget = time_budget
+        self.memory_budget = memory_budget
+        self.over_budget = over_budget
+        self._ordinals: Optional[np.ndarray] = None
+        self._ordinals_text: Optional[str] = None
+        self.steps = self._resolve(
+            name
+            for algorithm in self.algorithms
+            for name in self.requirements(algorithm)
+        )
+
+    def requirements(
+        self, algorithm: AlgorithmType, method: str = "exact"
+    ) -> Tuple[str, ...]:
+        """Get the intermediates an algorithm is evaluated from.
+
+        Args:
+            algorithm: Algorithm to look up
+            method: Method the algorithm is evaluated with
+
+        Returns:
+            Tuple[str, ...]: Names of the required intermediates
+        """
+        if method == "sampled":
+            return ("tolerance",)
+        return ALGORITHM_INTERMEDIATES[algorithm]
+
+    def fits(self, estimate: CostEstimate) -> bool:
+        """Check whether an estimate is within the budgets.
+
+        The sampled estimator stops drawing pairs when the time budget runs
+        out, so it always fits the time budget.
+
+        Args:
+            estimate: Modelled cost of a method
+
+        Returns:
+            bool: True if neither budget is exceeded
+        """
+        if self.memory_budget is not None and estimate.memory > self.memory_budget:
+            return False
+        if self.time_budget is None or estimate.method == "sampled":
+            return True
+        return estimate.seconds <= self.time_budget
+
+    def select(
+        self,
+        algorithm: AlgorithmType,
+        n: int,
+        expansion: float = 1.0,
+        ratio: Optional[float] = None,
+        model: Optional[Callable[..., List[CostEstimate]]] = None,
+    ) -> CostEstimate:
+        """Pick the most accurate method of an algorithm that fits the budgets.
+
+        Exact methods are preferred to the indexed one, which is preferred
+        to the sampled one. When none fits, the input is downsampled to the
+        longest prefix for which a non-sampled method fits, or refused.
+
+        Args:
+            algorithm: Algorithm to evaluate
+            n: Input length
+            expansion: Encoded symbols per input element
+            ratio: Candidate ratio of the sorted index, if measured
+            model: Cost model to use instead of the one of the algorithm
+
+        Returns:
+            CostEstimate: Chosen method, with the length it runs on
+
+        Raises:
+            ValueError: If no method fits and downsampling is not allowed
+                or does not help
+        """
+        if model is None:
+            model = COST_MODELS[algorithm]
+        for estimate in model(n, DEFAULT_M, expansion, ratio, self.memory_budget):
+            if self.fits(estimate):
+                return estimate
+
+        length = int(n * expansion)
+        if self.over_budget == "downsample":
+            # Costs grow with the length, so the longest prefix that fits
+            # is found by bisection.
+            low, high, best = 1, n - 1, None
+            while low <= high:
+                middle = (low + high) // 2
+                fitting = [
+                    estimate
+                    for estimate in model(
+                        middle, DEFAULT_M, expansion, ratio, self.memory_budget
+                    )
+                    if estimate.method != "sampled" and self.fits(estimate)
+                ]
+                if fitting:
+                    low, best = middle + 1, fitting[0]
+                else:
+                    high = middle - 1
+            if best is not None:
+                return best
+
+        raise ValueError(
+            f"{algorithm.value} on {length} samples exceeds the budget "
+            f"(time: {self.time_budget} s, memory: {self.memory_budget} bytes)"
+        )
+
+    def encode(
+        self, encoder: ChaosEncoder, text: str, encoding: EncodingModel
+    ) -> Union[np.ndarray, SparseOneHot, PackedBits]:
+        """Encode a text within the memory budget, sharing its code points.
+
+        The ordinal encoding is computed once per text and handed to the
+        encodings derived from it, so a report over several encodings
+        walks the text a single time.
+
+        Args:
+            encoder: Encoder applying the encoding models
+            text: Input text to encode
+            encoding: Encoding model applied to the text
+
+        Returns:
+            Union[np.ndarray, SparseOneHot, PackedBits]: Encoded text, one-hot
+            encodings being sparse and binary encodings packed
+
+        Raises:
+            ValueError: If the encoding exceeds the budget and downsampling
+                is not allowed
+        """
+        limited = self.limit_text(text, encoding)
+        if encoding == EncodingModel.BINARY:
+            return encoder.encode(limited, encoding, packed=True)
+        if encoding not in ORDINAL_ENCODINGS:
+            return encoder.encode(limited, encoding)
+
+        # Texts are limited to prefixes, whose code points are a prefix of
+        # the code points of any longer prefix already encoded.
+        if (
+            self._ordinals is None
+            or self._ordinals_text is not text
+            or len(self._ordinals) < len(limited)
+        ):
+            self._ordinals = encoder.encode(limited, EncodingModel.ORDINAL)
+            self._ordinals_text = text
+        ordinals = self._ordinals[: len(limited)]
+        if encoding == EncodingModel.ORDINAL:
+            return ordinals
+        if encoding == EncodingModel.ONE_HOT:
+            return encoder.encode(limited, encoding, ordinals=ordinals, dense=False)
+        return encoder.encode(limited, encoding, ordinals=ordinals)
+
+    def limit_text(self, text: str, encoding: EncodingModel) -> str:
+        """Fit a text to the memory budget before it is encoded.
+
+        Args:
+            text: Input text to encode
+            encoding: Encoding model applied to the text
+
+        Returns:
+            str: The text, or its longest prefix whose encoding fits
+
+        Raises:
+            ValueError: If the encoding exceeds the budget and downsampling
+                is not allowed
+        """
+        if self.memory_budget is None:
+            return text
+        per_character = ENCODED_BYTES_PER_CHARACTER.get(encoding, 8)
+        if encoding == EncodingModel.BINARY:
+            per_character *= utf8_bytes_per_character(text)
+        if len(text) * per_character <= self.memory_budget:
+            return text
+        if self.over_budget == "refuse":
+            raise ValueError(
+                f"{encoding.value} encoding of {len(text)} characters exceeds "
+                f"the memory budget of {self.memory_budget} bytes"
+            )
+        return text[: max(int(self.memory_budget // per_character), 1)]
+
+    def prepare(
+        self, data: Any, algorithms: Optional[Algorithms] = None
+    ) -> Intermediates:
+        """Choose the methods for a series and compute their intermediates.
+
+        Args:
+            data: Encoded series the algorithms run on
+            algorithms: Algorithms instance computing the template matches
+
+        Returns:
+            Intermediates: Intermediates holding every planned value
+
+        Raises:
+            ValueError: If an algorithm exceeds the budgets and downsampling
+                is not allowed
+        """
+        shared = Intermediates(data, algorithms)
+        n = len(shared.series)
+        budgeted = self.time_budget is not None or self.memory_budget is not None
+
+        if isinstance(shared.series, SparseOneHot):
+            rows, alphabet_size = (
+                len(shared.series.indices),
+                shared.series.alphabet_size,
+            )
+            shared.choices = {
+                algorithm: self.select(
+                    algorithm,
+                    rows,
+                    alphabet_size,
+                    model=ONE_HOT_COST_MODELS[algorithm],
+                )
+                for algorithm in self.algorithms
+            }
+        elif isinstance(shared.series, PackedBits):
+            shared.choices = {
+                algorithm: self.select(
+                    algorithm, n, model=PACKED_COST_MODELS[algorithm]
+                )
+                for algorithm in self.algorithms
+            }
+        else:
+            # The sorted index only pays off when few pairs are candidates,
+            # so its cost is measured on the series when a budget could use it.
+            ratio = None
+            if budgeted and "neighbor_counts" in self.steps:
+                ratio = candidate_ratio(
+                    shared.series, DEFAULT_M, shared.get("tolerance")
+                )
+            shared.choices = {
+                algorithm: self.select(algorithm, n, ratio=ratio)
+                for algorithm in self.algorithms
+            }
+
+        # SampEn and ApEn share their neighbor counts, their exact and
+        # indexed costs being the same.
+        for algorithm, choice in shared.choices.items():
+            if choice.method == "sampled":
+                continue
+            source = ALGORITHM_SOURCES[algorithm]
+            shared.lengths[source] = min(shared.lengths.get(source, n), choice.length)
+            if source == "neighbor_counts":
+                shared.matching_method = MATCHING_BACKENDS[choice.method]
+                if choice.tile_size is not None:
+                    shared.tile_size = choice.tile_size
+                if choice.max_pairs is not None:
+                    shared.max_pairs = choice.max_pairs
+        steps = self._resolve(
+            name
+            for algorithm, choice in shared.choices.items()
+            for name in self.requirements(algorithm, choice.method)
+        )
+        for name in steps:
+            shared.get(name)
+        return shared
+
+    def evaluate(self, algorithm: AlgorithmType, shared: Intermediates) -> float:
+        """Evaluate an algorithm from the intermediates of a series.
+
+        Args:
+            algorithm: Algorithm to evaluate
+            shared: Intermediates of the series
+
+        Returns:
+            float: Calculated entropy value
+
+        Raises:
+            ValueError: If the algorithm type is unsupported
+        """
+        choice = shared.choices.get(algorithm)
+        if algorithm == AlgorithmType.SHANNON:
+            return shared.algorithms.histogram_entropy(shared.get("symbol_counts"))
+        if algorithm == AlgorithmType.PERMUTATION:
+            return shared.algorithms.histogram_entropy(
+                shared.get("ordinal_pattern_counts")
+            )
+        if choice is not None and choice.method == "sampled":
+            return shared.algorithms.sample_entropy_estimate(
+                shared.series,
+                DEFAULT_M,
+                shared.get("tolerance"),
+                time_budget=self.time_budget,
+                batch_size=choice.max_pairs or DEFAULT_MAX_PAIRS,
+            ).entropy
+
+        # Neighbors are counted once and shared by SampEn and ApEn.
+        x = shared.source("neighbor_counts")
+        r = shared.get("tolerance")
+        neighbors = shared.get("neighbor_counts")
+        if algorithm == AlgorithmType.SAMPLE:
+            return shared.algorithms.sample_entropy(
+                x, DEFAULT_M, r, neighbors=neighbors
+            )
+        if algorithm == AlgorithmType.APPROXIMATE:
+            return shared.algorithms.approximate_entropy(
+                x, DEFAULT_M, r, neighbors=neighbors
+            )
+        raise ValueError(f"Unsupported algorithm type: {algorithm}")
+
+    def _resolve(self, names: Iterable[str]) -> List[str]:
+        """Order intermediates after their dependencies, once each.
+
+        Args:
+            names: Names of the required intermediates
+
+        Returns:
+            List[str]: Required intermediates and their dependencies
+        """
+        steps: List[str] = []
+
+        def _visit(name: str) -> None:
+            """Append an intermediate after its dependencies.
+
+            Args:
+                name: Name of the intermediate
+            """
+            if name in steps:
+                return
+            for dependency in INTERMEDIATE_DEPENDENCIES[name]:
+                _visit(dependency)
+            steps.append(name)
+
+        for name in names:
+            _visit(name)
+        return steps
@@ -0,0 +1,693 @@
+"""
+Compact representations of encoded text that the algorithms understand natively.
+This module provides a sparse one-hot representation holding the hot column of every row instead of a dense matrix,
+and a binary representation keeping 8 bits per byte whose statistics are computed from the packed bytes.
+"""
+
+import numpy as np
+from math import factorial
+from typing import Any, Iterator, List, Optional, Tuple
+from .kernels import (
+    DEFAULT_CHUNK_SIZE,
+    MAX_BINCOUNT_PATTERNS,
+    lehmer_codes,
+    merge_counts,
+)
+
+# Window keys hold one bit per sample of the window in an int64.
+MAX_KEY_BITS = 62
+
+# Packed windows of up to this many samples are counted from bit planes.
+MAX_PLANE_KEY_BITS = 5
+
+# Number of set bits of every byte value, for NumPy without np.bitwise_count.
+POPCOUNT_TABLE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(
+    axis=1, dtype=np.int64
+)
+
+
+def matches_by_key(dim: int, r: float) -> bool:
+    """Check whether templates of a one-hot series match exactly when equal.
+
+    One-hot samples are 0 or 1, so two templates are within a tolerance
+    0 < r <= 1 exactly when they are identical.
+
+    Args:
+        dim: Largest embedding dimension compared
+        r: Tolerance value
+
+    Returns:
+        bool: True if template matching reduces to comparing window keys
+    """
+    return 0 < r <= 1 and dim <= MAX_KEY_BITS
+
+
+def matching_pairs(multiplicities: Tuple[np.ndarray, int, int]) -> int:
+    """Count the matching ordered template pairs behind Sample Entropy.
+
+    Every template matches the other templates sharing its key. The last
+    template is left out, as in Algorithms.sample_entropy.
+
+    Args:
+        multiplicities: Template multiplicities as returned by
+            SparseOneHot.template_multiplicities()
+
+    Returns:
+        int: Number of matching ordered pairs
+    """
+    counts, last, _ = multiplicities
+    if len(counts) == 0:
+        return 0
+    return int(np.dot(counts, counts - 1)) - (last - 1)
+
+
+def template_phi(multiplicities: Tuple[np.ndarray, int, int]) -> float:
+    """Calculate the ApEn phi value from template multiplicities.
+
+    Args:
+        multiplicities: Template multiplicities as returned by
+            SparseOneHot.template_multiplicities()
+
+    Returns:
+        float: Calculated phi value
+    """
+    counts, _, n_templates = multiplicities
+    counts = counts.astype(np.float64)
+    return np.sum(counts * np.log(counts / n_templates)) / n_templates
+
+
+def key_pattern_counts(
+    keys: np.ndarray, counts: np.ndarray, order: int, dtype: Any = np.float64
+) -> np.ndarray:
+    """Count the ordinal patterns of 0/1 windows given by their keys.
+
+    Every distinct key is ranked once, ties being resolved by the same
+    argsort as for the dense series.
+
+    Args:
+        keys: Distinct window keys, bit k holding sample k of the window
+        counts: Number of windows of every key
+        order: Permutation order
+        dtype: Dtype of the dense series the windows are ranked as
+
+    Returns:
+        np.ndarray: Count of every pattern, as ordinal_pattern_counts()
+        would return it for the dense series
+    """
+    windows = (keys[:, None] >> np.arange(order)) & 1
+    codes = lehmer_codes(np.argsort(windows.astype(dtype), axis=1))
+
+    n_patterns = factorial(order)
+    if n_patterns <= MAX_BINCOUNT_PATTERNS:
+        pattern_counts = np.zeros(n_patterns, dtype=np.int64)
+        np.add.at(pattern_counts, codes, counts)
+        return pattern_counts
+
+    unique_codes, inverse = np.unique(codes, return_inverse=True)
+    pattern_counts = np.zeros(len(unique_codes), dtype=np.int64)
+    np.add.at(pattern_counts, inverse, counts)
+    return pattern_counts
+
+
+def popcount(data: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE << 7) -> int:
+    """Count the set bits of packed bytes.
+
+    Whole 8-byte words are counted as uint64 with np.bitwise_count when
+    NumPy provides it, and bytes are looked up in POPCOUNT_TABLE otherwise.
+
+    Args:
+        data: Packed uint8 bytes
+        chunk_size: Number of bytes counted at once
+
+    Returns:
+        int: Number of set bits
+    """
+    total = 0
+    for start in range(0, len(data), chunk_size):
+        chunk = np.ascontiguousarray(data[start : start + chunk_size])
+        if hasattr(np, "bitwise_count"):
+            n_words = len(chunk) // 8
+            words = chunk[: 8 * n_words].view(np.uint64)
+            total += int(np.bitwise_count(words).sum(dtype=np.int64))
+            chunk = chunk[8 * n_words :]
+        total += int(POPCOUNT_TABLE[chunk].sum())
+    return total
+
+
+def _bit_std(length: int, ones: int, ddof: int) -> float:
+    """Calculate the standard deviation of a 0/1 series from its ones.
+
+    Args:
+        length: Number of samples
+        ones: Number of ones
+        ddof: Delta degrees of freedom
+
+    Returns:
+        float: Standard deviation of the samples
+    """
+    mean = ones / length
+    squares = ones * (1 - mean) ** 2 + (length - ones) * mean**2
+    return float(np.sqrt(squares / (length - ddof)))
+
+
+def _bit_counts(length: int, ones: int) -> np.ndarray:
+    """Count the zeros and ones of a 0/1 series, present values only.
+
+    Args:
+        length: Number of samples
+        ones: Number of ones
+
+    Returns:
+        np.ndarray: Occurrence counts of 0 and 1, as np.unique would return them
+    """
+    counts = np.array([length - ones, ones])
+    return counts[counts > 0]
+
+
+class SparseOneHot:
+    """One-hot encoding stored as the hot column index of every row.
+
+    The represented series is the row-major flattening of the one-hot
+    matrix, of length len(indices) * alphabet_size, but only O(N) memory
+    is used. The entropy algorithms compute their statistics from the
+    positions of the ones without building the matrix.
+    """
+
+    def __init__(self, indices: Any, alphabet_size: int) -> None:
+        """Initialize the representation.
+
+        Args:
+            indices: Column of the one in every row
+            alphabet_size: Number of columns of the one-hot matrix
+
+        Raises:
+            ValueError: If an index is outside the alphabet
+        """
+        self.indices = np.asarray(indices).ravel()
+        self.alphabet_size = int(alphabet_size)
+        if self.indices.size > 0 and (
+            self.indices.min() < 0 or self.indices.max() >= self.alphabet_size
+        ):
+            raise ValueError("One-hot indices must lie within the alphabet")
+
+    def __len__(self) -> int:
+        """Get the length of the flattened one-hot series.
+
+        Returns:
+            int: Number of rows times the alphabet size
+        """
+        return len(self.indices) * self.alphabet_size
+
+    def __array__(self, dtype: Optional[Any] = None, copy: Optional[bool] = None):
+        """Build the dense flattened series for code that needs an array.
+
+        Args:
+            dtype: Requested dtype, defaults to float64
+            copy: Ignored, the array is always built anew
+
+        Returns:
+            np.ndarray: Dense flattened one-hot series
+        """
+        dense = self.toarray()
+        return dense if dtype is None else dense.astype(dtype)
+
+    def toarray(self) -> np.ndarray:
+        """Build the dense flattened one-hot series.
+
+        Returns:
+            np.ndarray: float64 array of length len(self)
+        """
+        dense = np.zeros(len(self), dtype=np.float64)
+        dense[self.hot_positions()] = 1
+        return dense
+
+    def prefix(self, length: int) -> "SparseOneHot":
+        """Keep the whole rows within the first samples of the series.
+
+        Args:
+            length: Number of leading samples of the flattened series
+
+        Returns:
+            SparseOneHot: Representation of the leading rows
+        """
+        rows = max(length, 0) // max(self.alphabet_size, 1)
+        return SparseOneHot(self.indices[:rows], self.alphabet_size)
+
+    def hot_positions(self) -> np.ndarray:
+        """Get the positions of the ones in the flattened series.
+
+        Returns:
+            np.ndarray: Increasing int64 positions, one per row
+        """
+        rows = np.arange(len(self.indices), dtype=np.int64)
+        return rows * self.alphabet_size + self.indices
+
+    def std(self, ddof: int = 0) -> float:
+        """Calculate the standard deviation of the flattened series.
+
+        Args:
+            ddof: Delta degrees of freedom
+
+        Returns:
+            float: Standard deviation of the 0/1 samples
+        """
+        return _bit_std(len(self), len(self.indices), ddof)
+
+    def symbol_counts(self) -> np.ndarray:
+        """Count the zeros and ones of the flattened series.
+
+        Returns:
+            np.ndarray: Occurrence counts of 0 and 1, present values only,
+            as np.unique would return them
+        """
+        return _bit_counts(len(self), len(self.indices))
+
+    def window_keys(self, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Encode the windows holding at least one 1 as bit keys.
+
+        Bit k of the key of the window starting at s is the sample at
+        s + offsets[k]. Windows are only found from the ones they contain,
+        all others having key 0.
+
+        Args:
+            offsets: Increasing offsets of the window samples
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, int]: Increasing start positions
+            of the windows holding a 1, their keys, and the total number of
+            windows
+        """
+        n_windows = max(len(self) - int(offsets[-1]), 0)
+        starts = (self.hot_positions()[:, None] - offsets[None, :]).ravel()
+        bits = np.broadcast_to(
+            np.left_shift(1, np.arange(len(offsets), dtype=np.int64)),
+            (len(self.indices), len(offsets)),
+        ).ravel()
+        inside = (starts >= 0) & (starts < n_windows)
+        starts, bits = starts[inside], bits[inside]
+
+        order = np.argsort(starts, kind="stable")
+        starts, bits = starts[order], bits[order]
+        if len(starts) == 0:
+            return starts, bits, n_windows
+        first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+        return starts[first], np.add.reduceat(bits, first), n_windows
+
+    def key_counts(self, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Count the windows of every key, including the all-zero one.
+
+        Args:
+            offsets: Increasing offsets of the window samples
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distinct keys and their counts
+        """
+        _, keys, n_windows = self.window_keys(offsets)
+        keys, counts = np.unique(keys, return_counts=True)
+        zeros = n_windows - int(counts.sum())
+        if zeros > 0:
+            keys = np.r_[0, keys]
+            counts = np.r_[zeros, counts]
+        return keys, counts
+
+    def template_multiplicities(self, dim: int) -> Tuple[np.ndarray, int, int]:
+        """Count the identical templates of every dim-dimensional template.
+
+        Args:
+            dim: Embedding dimension
+
+        Returns:
+            Tuple[np.ndarray, int, int]: Number of templates sharing every
+            distinct key, number of templates sharing the key of the last
+            template, and the number of templates
+
+        Raises:
+            ValueError: If dim exceeds MAX_KEY_BITS
+        """
+        if dim > MAX_KEY_BITS:
+            raise ValueError(f"Template keys support dimensions up to {MAX_KEY_BITS}")
+
+        offsets = np.arange(dim, dtype=np.int64)
+        starts, keys, n_templates = self.window_keys(offsets)
+        if n_templates == 0:
+            return np.zeros(0, dtype=np.int64), 0, 0
+
+        last = keys[-1] if len(starts) > 0 and starts[-1] == n_templates - 1 else 0
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        zeros = n_templates - len(keys)
+        if zeros > 0:
+            unique_keys = np.r_[0, unique_keys]
+            counts = np.r_[zeros, counts]
+        last_count = int(counts[np.searchsorted(unique_keys, last)])
+        return counts.astype(np.int64), last_count, n_templates
+
+    def ordinal_pattern_counts(self, order: int, delay: int = 1) -> np.ndarray:
+        """Count the ordinal patterns of the flattened series.
+
+        Windows are counted by key and every distinct key is ranked once,
+        ties being resolved by the same argsort as for a dense series.
+
+        Args:
+            order: Permutation order
+            delay: Time delay between samples of a window
+
+        Returns:
+            np.ndarray: Count of every pattern, as ordinal_pattern_counts()
+            would return it for the dense series
+
+        Raises:
+            ValueError: If order exceeds MAX_KEY_BITS
+        """
+        if order > MAX_KEY_BITS:
+            raise ValueError(f"Window keys support orders up to {MAX_KEY_BITS}")
+
+        offsets = np.arange(order, dtype=np.int64) * delay
+        keys, counts = self.key_counts(offsets)
+        return key_pattern_counts(keys, counts, order)
+
+
+class PackedBits:
+    """Bit series stored 8 bits per byte in the np.packbits layout.
+
+    Bit k of the series is bit 7 - k % 8 of byte k // 8, most significant
+    first, so that np.unpackbits restores the series. Only n_bits bits of
+    the last byte are part of the series.
+    """
+
+    def __init__(self, data: Any, n_bits: Optional[int] = None) -> None:
+        """Initialize the representation.
+
+        Args:
+            data: Packed bytes, as returned by np.packbits
+            n_bits: Number of bits of the series, defaults to 8 per byte
+
+        Raises:
+            ValueError: If n_bits does not fit in the packed bytes
+        """
+        self.data = (
+            np.frombuffer(data, dtype=np.uint8)
+            if isinstance(data, (bytes, bytearray))
+            else np.asarray(data, dtype=np.uint8).ravel()
+        )
+        self.n_bits = 8 * len(self.data) if n_bits is None else int(n_bits)
+        if len(self.data) != (self.n_bits + 7) // 8:
+            raise ValueError("n_bits must end within the last packed byte")
+
+    @classmethod
+    def pack(cls, bits: Any) -> "PackedBits":
+        """Pack a series of 0/1 samples.
+
+        Args:
+            bits: Series of 0/1 samples
+
+        Returns:
+            PackedBits: Packed representation of the series
+        """
+        bits = np.asarray(bits).ravel()
+        return cls(np.packbits(bits != 0), len(bits))
+
+    def __len__(self) -> int:
+        """Get the number of bits of the series.
+
+        Returns:
+            int: Number of bits
+        """
+        return self.n_bits
+
+    def __array__(self, dtype: Optional[Any] = None, copy: Optional[bool] = None):
+        """Unpack the series for code that needs an array.
+
+        Args:
+            dtype: Requested dtype, defaults to int8
+            copy: Ignored, the array is always built anew
+
+        Returns:
+            np.ndarray: Unpacked 0/1 series
+        """
+        bits = self.unpack()
+        return bits if dtype is None else bits.astype(dtype)
+
+    def unpack(self) -> np.ndarray:
+        """Unpack the series to one sample per bit.
+
+        Returns:
+            np.ndarray: int8 array of 0/1 samples
+        """
+        return np.unpackbits(self.data, count=self.n_bits).view(np.int8)
+
+    def toarray(self) -> np.ndarray:
+        """Unpack the series to the int8 array it was encoded as.
+
+        Returns:
+            np.ndarray: int8 array of 0/1 samples
+        """
+        return self.unpack()
+
+    def prefix(self, length: int) -> "PackedBits":
+        """Keep the first bits of the series.
+
+        Args:
+            length: Number of leading bits
+
+        Returns:
+            PackedBits: Representation of the leading bits
+        """
+        length = min(max(length, 0), self.n_bits)
+        return PackedBits(self.data[: (length + 7) // 8], length)
+
+    def ones(self) -> int:
+        """Count the ones of the series from the popcount of its bytes.
+
+        Returns:
+            int: Number of ones
+        """
+        full, tail = divmod(self.n_bits, 8)
+        ones = popcount(self.data[:full])
+        if tail > 0:
+            ones += int(POPCOUNT_TABLE[self.data[full] >> (8 - tail)])
+        return ones
+
+    def std(self, ddof: int = 0) -> float:
+        """Calculate the standard deviation of the series.
+
+        Args:
+            ddof: Delta degrees of freedom
+
+        Returns:
+            float: Standard deviation of the 0/1 samples
+        """
+        return _bit_std(self.n_bits, self.ones(), ddof)
+
+    def symbol_counts(self) -> np.ndarray:
+        """Count the zeros and ones of the series.
+
+        Returns:
+            np.ndarray: Occurrence counts of 0 and 1, present values only,
+            as np.unique would return them
+        """
+        return _bit_counts(self.n_bits, self.ones())
+
+    def bits(self, positions: np.ndarray) -> np.ndarray:
+        """Read the samples at some positions of the series.
+
+        Args:
+            positions: Positions of the samples
+
+        Returns:
+            np.ndarray: 0/1 samples
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        return (self.data[positions >> 3] >> (7 - (positions & 7))) & 1
+
+    def iter_window_keys(
+        self, offsets: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE << 4
+    ) -> Iterator[np.ndarray]:
+        """Encode every window as a bit key, chunk by chunk.
+
+        Bit k of the key of the window starting at s is the sample at
+        s + offsets[k]. Windows are bit-sliced by the position of their
+        start within its byte: for the starts sharing that phase, the
+        sample at any offset sits at a fixed bit of consecutive bytes, so
+        it is read with one shift over a slice of the packed bytes. Keys
+        are yielded phase by phase, not in the order of the windows.
+
+        Args:
+            offsets: Increasing offsets of the window samples
+            chunk_size: Number of windows of one phase encoded at once
+
+        Yields:
+            np.ndarray: Keys of the next chunk of windows
+        """
+        n_windows = max(self.n_bits - int(offsets[-1]), 0)
+        dtype = next(
+            dtype
+            for dtype in (np.uint8, np.uint16, np.uint32, np.int64)
+            if len(offsets) <= 8 * np.dtype(dtype).itemsize
+        )
+
+        for phase in range(8):
+            n_starts = max((n_windows - phase + 7) // 8, 0)
+            for start in range(0, n_starts, chunk_size):
+                stop = min(start + chunk_size, n_starts)
+                keys = np.zeros(stop - start, dtype=dtype)
+                for k, offset in enumerate(offsets):
+                    byte, bit = divmod(phase + int(offset), 8)
+                    samples = (self.data[start + byte : stop + byte] >> (7 - bit)) & 1
+                    keys |= samples.astype(dtype) << k
+                yield keys
+
+    def planes(self, offsets: np.ndarray, start: int, stop: int) -> List[np.ndarray]:
+        """Get the bit planes of the windows starting in a range of words.
+
+        Plane k holds the sample at offset offsets[k] of every window, the
+        windows starting at 64 * w, ..., 64 * w + 63 filling word w from
+        its most significant bit. Planes are read from the packed bytes as
+        big-endian words shifted by the offset, bits past the end of the
+        series being 0.
+
+        Args:
+            offsets: Increasing offsets of the window samples
+            start: First word
+            stop: Word past the last one
+
+        Returns:
+            List[np.ndarray]: uint64 plane of every offset
+        """
+        n_words = stop - start
+        end = 8 * stop + int(offsets[-1]) // 8 + 9
+        buffer = np.zeros(end - 8 * start, dtype=np.uint8)
+        part = self.data[8 * start : end]
+        buffer[: len(part)] = part
+
+        planes = []
+        for offset in offsets:
+            byte, bit = divmod(int(offset), 8)
+            plane = buffer[byte : byte + 8 * n_words].view(">u8").astype(np.uint64)
+            if bit > 0:
+                carry = buffer[byte + 8 : byte + 8 * n_words + 8 : 8].astype(np.uint64)
+                plane = (plane << np.uint64(bit)) | (carry >> np.uint64(8 - bit))
+            planes.append(plane)
+        return planes
+
+    def plane_key_counts(
+        self, offsets: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> np.ndarray:
+        """Count the windows of every key with popcounts over bit planes.
+
+        The windows of every key are the set bits of the AND of the planes
+        of its ones and the complemented planes of its zeros. These masks
+        are built one plane at a time, each splitting the masks of the
+        previous planes by the new sample, so 2**len(offsets) popcounts
+        over the packed words count every key.
+
+        Args:
+            offsets: Increasing offsets of the window samples
+            chunk_size: Number of words processed at once
+
+        Returns:
+            np.ndarray: Count of every key in [0, 2**len(offsets))
+        """
+        n_windows = max(self.n_bits - int(offsets[-1]), 0)
+        n_words = (n_windows + 63) // 64
+        counts = np.zeros(1 << len(offsets), dtype=np.int64)
+
+        for start in range(0, n_words, chunk_size):
+            stop = min(start + chunk_size, n_words)
+            valid = np.full(stop - start, np.iinfo(np.uint64).max, dtype=np.uint64)
+            tail = n_windows - 64 * (stop - 1)
+            if tail < 64:
+                valid[-1] = np.uint64(((1 << tail) - 1) << (64 - tail))
+
+            masks = [valid]
+            for plane in self.planes(offsets, start, stop):
+                ones = [mask & plane for mask in masks]
+                masks = [mask ^ one for mask, one in zip(masks, ones)] + ones
+            counts += [popcount(mask.view(np.uint8)) for mask in masks]
+        return counts
+
+    def key_counts(self, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Count the windows of every key.
+
+        Short windows are counted from bit planes and longer ones from their
+        keys, the number of plane masks growing as 2**len(offsets).
+
+        Args:
+            offsets: Increasing offsets of the window samples
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distinct keys and their counts
+        """
+        n_keys = 1 << len(offsets)
+        if len(offsets) <= MAX_PLANE_KEY_BITS:
+            totals = self.plane_key_counts(offsets)
+            keys = np.flatnonzero(totals)
+            return keys, totals[keys]
+        if n_keys <= MAX_BINCOUNT_PATTERNS:
+            totals = np.zeros(n_keys, dtype=np.int64)
+            for keys in self.iter_window_keys(offsets):
+                totals += np.bincount(keys, minlength=n_keys)
+            keys = np.flatnonzero(totals)
+            return keys, totals[keys]
+
+        keys, counts = [], []
+        for chunk_keys in self.iter_window_keys(offsets):
+            chunk_keys, chunk_counts = np.unique(chunk_keys, return_counts=True)
+            keys.append(chunk_keys.astype(np.int64))
+            counts.append(chunk_counts)
+        if not keys:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return merge_counts(keys, counts)
+
+    def template_multiplicities(self, dim: int) -> Tuple[np.ndarray, int, int]:
+        """Count the identical templates of every dim-dimensional template.
+
+        Args:
+            dim: Embedding dimension
+
+        Returns:
+            Tuple[np.ndarray, int, int]: Number of templates sharing every
+            distinct key, number of templates sharing the key of the last
+            template, and the number of templates
+
+        Raises:
+            ValueError: If dim exceeds MAX_KEY_BITS
+        """
+        if dim > MAX_KEY_BITS:
+            raise ValueError(f"Template keys support dimensions up to {MAX_KEY_BITS}")
+
+        offsets = np.arange(dim, dtype=np.int64)
+        n_templates = max(self.n_bits - dim + 1, 0)
+        if n_templates == 0:
+            return np.zeros(0, dtype=np.int64), 0, 0
+
+        keys, counts = self.key_counts(offsets)
+        last_bits = self.bits(n_templates - 1 + offsets).astype(np.int64)
+        last = int(np.sum(last_bits << offsets))
+        last_count = int(counts[np.searchsorted(keys, last)])
+        return counts.astype(np.int64), last_count, n_templates
+
+    def ordinal_pattern_counts(self, order: int, delay: int = 1) -> np.ndarray:
+        """Count the ordinal patterns of the series.
+
+        Args:
+            order: Permutation order
+            delay: Time delay between samples of a window
+
+        Returns:
+            np.ndarray: Count of every pattern, as ordinal_pattern_counts()
+            would return it for the unpacked series
+
+        Raises:
+            ValueError: If order exceeds MAX_KEY_BITS
+        """
+        if order > MAX_KEY_BITS:
+            raise ValueError(f"Window keys support orders up to {MAX_KEY_BITS}")
+
+        offsets = np.arange(order, dtype=np.int64) * delay
+        keys, counts = self.key_counts(offsets)
+        return key_pattern_counts(keys, counts, order, np.int8)
+
+
+# Representations of 0/1 series whose statistics are computed without
+# building the dense series.
+BINARY_REPRESENTATIONS = (SparseOneHot, PackedBits)
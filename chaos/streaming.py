@@ -0,0 +1,110 @@
+"""
+Online entropy estimation for data that does not fit in memory.
+This module provides estimators that are fed chunk by chunk and keep only a histogram of the symbols seen.
+"""
+
+import numpy as np
+from typing import Any, Dict, Sequence
+from .kernels import entropy_from_counts
+
+MAX_HISTOGRAM_SYMBOLS = 1 << 24
+
+
+class StreamingEntropy:
+    """Incremental Shannon entropy estimator over a stream of chunks."""
+
+    def __init__(self) -> None:
+        """Initialize an empty estimator."""
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._other_counts: Dict[Any, int] = {}
+        self.total = 0
+
+    def update(self, chunk: Sequence[Any]) -> "StreamingEntropy":
+        """Add the symbols of a chunk to the histogram.
+
+        Non-negative integral symbols below MAX_HISTOGRAM_SYMBOLS, such as
+        ordinal or binary encodings, are counted in an array indexed by the
+        symbol. Any other symbols are kept in a dictionary. Symbols are
+        routed one by one, so that a symbol is always counted in the same
+        place whatever the rest of its chunk holds.
+
+        Args:
+            chunk: Input sequence data to add
+
+        Returns:
+            StreamingEntropy: The estimator itself, to allow chaining
+        """
+        data = np.asarray(chunk).ravel()
+        if data.size == 0:
+            return self
+
+        if data.dtype.kind in "iubf":
+            histogram = (data >= 0) & (data < MAX_HISTOGRAM_SYMBOLS)
+            if data.dtype.kind == "f":
+                histogram &= data == np.floor(data)
+            if histogram.all():
+                self._add_counts(np.bincount(data.astype(np.intp, copy=False)))
+                other = data[:0]
+            else:
+                self._add_counts(np.bincount(data[histogram].astype(np.intp)))
+                other = data[~histogram]
+        else:
+            other = data
+
+        if other.size > 0:
+            symbols, counts = np.unique(other, return_counts=True)
+            for symbol, count in zip(symbols.tolist(), counts.tolist()):
+                self._other_counts[symbol] = self._other_counts.get(symbol, 0) + count
+
+        self.total += data.size
+        return self
+
+    def merge(self, other: "StreamingEntropy") -> "StreamingEntropy":
+        """Combine two estimators into a new one covering both streams.
+
+        Args:
+            other: Estimator to merge with this one
+
+        Returns:
+            StreamingEntropy: New estimator holding the counts of both
+        """
+        merged = StreamingEntropy()
+        merged._add_counts(self._counts)
+        merged._add_counts(other._counts)
+        merged._other_counts = dict(self._other_counts)
+        for symbol, count in other._other_counts.items():
+            merged._other_counts[symbol] = merged._other_counts.get(symbol, 0) + count
+        merged.total = self.total + other.total
+        return merged
+
+    def counts(self) -> np.ndarray:
+        """Get the occurrence counts of the symbols seen so far.
+
+        Returns:
+            np.ndarray: Occurrence counts, possibly including zeros
+        """
+        other = np.fromiter(self._other_counts.values(), dtype=np.int64)
+        return np.concatenate([self._counts, other])
+
+    def entropy(self, base: int = 2) -> float:
+        """Calculate the Shannon entropy of the symbols seen so far.
+
+        Args:
+            base: Base for logarithm calculation, defaults to 2
+
+        Returns:
+            float: Calculated Shannon entropy value
+        """
+        return entropy_from_counts(self.counts(), base)
+
+    def _add_counts(self, counts: np.ndarray) -> None:
+        """Add a dense histogram to the array-backed counts.
+
+        Args:
+            counts: Occurrence counts indexed by symbol
+        """
+        if len(counts) > len(self._counts):
+            grown = np.zeros(len(counts), dtype=np.int64)
+            grown[: len(self._counts)] = self._counts
+            self._counts = grown
+        self._counts[: len(counts)] += counts
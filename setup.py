@@ -21,6 +21,9 @@ setup(
         "pytest-mock==3.14.0",
         "numpy",
     ],
+    extras_require={
+        "jit": ["numba"],
+    },
     author="Aditya Patange (AdiPat)",
     author_email="contact.adityapatange@gmail.com",
     description="Chaos is a minimal, AI-based entropy analyzer for Python developers.",
@@ -0,0 +1,174 @@
+import numpy as np
+import pytest
+from chaos.algorithms import Algorithms
+
+
+@pytest.mark.parametrize("scale_range", [0, 1])
+def test_multiscale_entropy_parallel_few_scales(scale_range):
+    x = np.random.default_rng(0).normal(size=300)
+    parallel = Algorithms().multiscale_entropy(x, scale_range, workers=2)
+    serial = Algorithms().multiscale_entropy(x, scale_range)
+    assert len(parallel) == scale_range
+    np.testing.assert_array_equal(parallel, serial)
+
+
+def test_multiscale_entropy_parallel_matches_serial():
+    x = np.random.default_rng(0).normal(size=300)
+    parallel = Algorithms().multiscale_entropy(x, 3, workers=2)
+    serial = Algorithms().multiscale_entropy(x, 3)
+    np.testing.assert_array_equal(parallel, serial)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.int64])
+def test_precomputed_neighbors_match_direct_evaluation(dtype):
+    x = (np.random.default_rng(1).normal(size=600) * 3).astype(dtype)
+    algorithms = Algorithms()
+    neighbors = algorithms.count_neighbors(x, 2, 1.5)
+    assert algorithms.sample_entropy(
+        x, 2, 1.5, neighbors=neighbors
+    ) == algorithms.sample_entropy(x, 2, 1.5)
+    assert algorithms.approximate_entropy(
+        x, 2, 1.5, neighbors=neighbors
+    ) == algorithms.approximate_entropy(x, 2, 1.5)
+
+
+@pytest.mark.parametrize("window", [1, 2, 7, 50, 200])
+@pytest.mark.parametrize("alphabet", [1, 3, 40])
+def test_rolling_shannon_entropy_matches_windows(window, alphabet):
+    data = np.random.default_rng(3).integers(0, alphabet, 200)
+    algorithms = Algorithms()
+    rolling = algorithms.rolling_shannon_entropy(data, window)
+    expected = [
+        algorithms.shannon_entropy(data[start : start + window])
+        for start in range(len(data) - window + 1)
+    ]
+    np.testing.assert_allclose(rolling, expected, rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("window", [5, 20, 150])
+@pytest.mark.parametrize("order, delay", [(2, 1), (3, 1), (3, 2), (4, 3)])
+@pytest.mark.parametrize("dtype", [np.float64, np.int64])
+def test_rolling_permutation_entropy_matches_windows(window, order, delay, dtype):
+    span = delay * (order - 1) + 1
+    if window < span:
+        return
+    x = (np.random.default_rng(4).normal(size=150) * 2).astype(dtype)
+    algorithms = Algorithms()
+    rolling = algorithms.rolling_permutation_entropy(x, window, order, delay)
+    expected = [
+        algorithms.permutation_entropy(x[start : start + window], order, delay)
+        for start in range(len(x) - window + 1)
+    ]
+    np.testing.assert_allclose(rolling, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_rolling_permutation_entropy_rejects_short_window():
+    with pytest.raises(ValueError):
+        Algorithms().rolling_permutation_entropy(np.arange(10.0), 2, 3)
+
+
+@pytest.mark.parametrize("axis", [0, 1, -1])
+def test_batch_entropy_along_axis_matches_series(axis):
+    batch = np.random.default_rng(5).integers(0, 6, (4, 30, 5))
+    algorithms = Algorithms()
+    series = np.moveaxis(batch, axis, -1)
+    shannon = algorithms.shannon_entropy(batch, axis=axis)
+    permutation = algorithms.permutation_entropy(batch, 3, 2, axis=axis)
+    assert shannon.shape == permutation.shape == series.shape[:-1]
+    for index in np.ndindex(series.shape[:-1]):
+        assert shannon[index] == pytest.approx(
+            algorithms.shannon_entropy(series[index]), rel=1e-12
+        )
+        assert permutation[index] == pytest.approx(
+            algorithms.permutation_entropy(series[index], 3, 2), rel=1e-12
+        )
+
+
+@pytest.mark.parametrize("lengths", [[0, 1, 2, 3, 40, 0, 17], [5], [0, 0]])
+@pytest.mark.parametrize("order, delay", [(2, 1), (3, 1), (3, 3)])
+def test_batch_entropy_of_ragged_series_matches_series(lengths, order, delay):
+    x = np.random.default_rng(6).normal(size=sum(lengths))
+    offsets = np.r_[0, np.cumsum(lengths)]
+    algorithms = Algorithms()
+    shannon = algorithms.shannon_entropy(np.round(x), offsets=offsets)
+    permutation = algorithms.permutation_entropy(x, order, delay, offsets=offsets)
+    assert shannon.dtype == permutation.dtype == np.float64
+    for k, (start, stop) in enumerate(zip(offsets[:-1], offsets[1:])):
+        series = x[start:stop]
+        span = delay * (order - 1) + 1
+        expected = (
+            algorithms.permutation_entropy(series, order, delay)
+            if len(series) >= span
+            else 0.0
+        )
+        assert permutation[k] == pytest.approx(expected, rel=1e-12, abs=1e-12)
+        if len(series) > 0:
+            assert shannon[k] == pytest.approx(
+                algorithms.shannon_entropy(np.round(series)), rel=1e-12, abs=1e-12
+            )
+
+
+def test_batch_permutation_entropy_of_short_series_is_float():
+    result = Algorithms().permutation_entropy(np.zeros((3, 2)), axis=1)
+    assert result.dtype == np.float64
+    np.testing.assert_array_equal(result, 0.0)
+
+
+def test_batch_entropy_rejects_invalid_offsets():
+    algorithms = Algorithms()
+    with pytest.raises(ValueError):
+        algorithms.shannon_entropy(np.arange(5), offsets=[0, 3])
+    with pytest.raises(ValueError):
+        algorithms.shannon_entropy(np.arange(5), axis=0, offsets=[0, 5])
+
+
+def pair_counts(algorithms, x, m, r):
+    counts_m, counts_m1 = algorithms.count_neighbors(x, m, r, method="brute")
+    return int(np.sum(counts_m1[: len(x) - m - 1])), int(np.sum(counts_m[: len(x) - m]))
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("dtype", [np.float64, np.int64])
+@pytest.mark.parametrize("m", [1, 2, 3])
+def test_tolerance_sweep_matches_single_tolerances(dtype, m):
+    x = (np.random.default_rng(7).normal(size=400) * 4).astype(dtype)
+    r_values = [1.5, 0.0, 0.4, 3.0, 1.5, 0.8]
+    algorithms = Algorithms()
+    sweep = algorithms.tolerance_sweep(x, m, r_values, tile_size=64)
+    assert sweep.parameter == "r"
+    assert sweep.values == r_values
+    for k, r in enumerate(r_values):
+        A, B = pair_counts(algorithms, x, m, r)
+        assert (sweep.extended_matches[k], sweep.matches[k]) == (A, B)
+        assert sweep.sample_entropy[k] == pytest.approx(
+            algorithms.sample_entropy(x, m, r, method="brute"), rel=1e-12
+        )
+        # r = 0 matches nothing, not even a template with itself, so
+        # ApEn is nan both ways.
+        assert sweep.approximate_entropy[k] == pytest.approx(
+            algorithms.approximate_entropy(x, m, r, method="brute"),
+            rel=1e-12,
+            abs=1e-12,
+            nan_ok=True,
+        )
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.int64])
+@pytest.mark.parametrize("r", [0.5, 2.0])
+def test_dimension_sweep_matches_single_dimensions(dtype, r):
+    x = (np.random.default_rng(8).normal(size=400) * 4).astype(dtype)
+    algorithms = Algorithms()
+    sweep = algorithms.dimension_sweep(x, 5, r, tile_size=64)
+    assert sweep.parameter == "m"
+    assert sweep.values == [1, 2, 3, 4, 5]
+    for k, m in enumerate(sweep.values):
+        A, B = pair_counts(algorithms, x, m, r)
+        assert (sweep.extended_matches[k], sweep.matches[k]) == (A, B)
+        assert sweep.sample_entropy[k] == pytest.approx(
+            algorithms.sample_entropy(x, m, r, method="brute"), rel=1e-12
+        )
+        assert sweep.approximate_entropy[k] == pytest.approx(
+            algorithms.approximate_entropy(x, m, r, method="brute"),
+            rel=1e-12,
+            abs=1e-12,
+        )
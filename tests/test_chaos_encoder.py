@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from chaos.chaos_encoder import ChaosEncoder
+from chaos.models import EncodingModel
+
+
+@pytest.mark.parametrize("text", ["aéÿ", "a✓"])
+def test_ordinal_dtype_too_small_raises(text):
+    with pytest.raises(ValueError):
+        ChaosEncoder().encode(text, EncodingModel.ORDINAL, dtype=np.int8)
+
+
+@pytest.mark.parametrize("text", ["", "abc", "aéÿ", "a✓汉"])
+def test_ordinal_dtype_holding_code_points(text):
+    codes = ChaosEncoder().encode(text, EncodingModel.ORDINAL, dtype=np.uint16)
+    assert codes.dtype == np.uint16
+    assert codes.tolist() == [ord(character) for character in text]
+
+
+@pytest.mark.parametrize("encoding", ["nope", "utf-16"])
+def test_binary_unsupported_encoding_raises(encoding):
+    with pytest.raises(ValueError, match="Unsupported binary text encoding"):
+        ChaosEncoder().encode("abc", EncodingModel.BINARY, encoding=encoding)
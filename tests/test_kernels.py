@@ -0,0 +1,68 @@
+import tracemalloc
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+from chaos.algorithms import Algorithms
+from chaos.kernels import (
+    MAX_ORDER,
+    candidate_ratio,
+    hashed_neighbor_counts,
+    lehmer_codes,
+    neighbor_counts,
+    sorted_neighbor_counts,
+)
+
+
+@pytest.mark.parametrize("r", [-0.1, 0.0])
+def test_sorted_neighbor_counts_non_positive_tolerance(r):
+    x = np.random.default_rng(0).normal(size=500)
+    counts_m, counts_m1 = sorted_neighbor_counts(x, 2, r)
+    assert len(counts_m) == 499 and not counts_m.any()
+    assert len(counts_m1) == 498 and not counts_m1.any()
+    assert candidate_ratio(x, 2, r) >= 0
+
+
+@pytest.mark.parametrize("method", ["auto", "sorted", "brute"])
+def test_sample_entropy_negative_tolerance(method):
+    x = np.random.default_rng(0).normal(size=5000)
+    assert Algorithms().sample_entropy(x, 2, -0.1, method=method) == np.inf
+
+
+@pytest.mark.parametrize("alphabet", [2, 7, 300])
+@pytest.mark.parametrize("m", [1, 2, 3])
+def test_hashed_neighbor_counts_match_tiled_counts(alphabet, m):
+    x = np.random.default_rng(alphabet).integers(0, alphabet, 2000)
+    expected = neighbor_counts(x, m, 0.5)
+    counts = hashed_neighbor_counts(x, m, 0.5)
+    np.testing.assert_array_equal(counts[0], expected[0])
+    np.testing.assert_array_equal(counts[1], expected[1])
+
+
+def test_hashed_neighbor_counts_large_alphabet_memory():
+    x = np.random.default_rng(0).integers(0, 2000, 100_000)
+    tracemalloc.start()
+    try:
+        counts_m, counts_m1 = hashed_neighbor_counts(x, 2, 0.5)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert len(counts_m) == len(x) - 1 and len(counts_m1) == len(x) - 2
+    assert peak < 64 * len(x) * 8
+
+
+def test_permutation_entropy_highest_order():
+    x = np.random.default_rng(0).normal(size=200)
+    codes = lehmer_codes(np.argsort(sliding_window_view(x, MAX_ORDER), axis=1))
+    assert codes.min() >= 0
+    assert Algorithms().permutation_entropy(x, MAX_ORDER) == pytest.approx(
+        np.log2(len(codes))
+    )
+
+
+@pytest.mark.parametrize("n", [3, 200])
+def test_permutation_entropy_rejects_overflowing_order(n):
+    x = np.random.default_rng(0).normal(size=n)
+    with pytest.raises(ValueError, match="at most"):
+        Algorithms().permutation_entropy(x, MAX_ORDER + 2)
+    with pytest.raises(ValueError, match="at most"):
+        Algorithms().rolling_permutation_entropy(x, n + 30, MAX_ORDER + 1)
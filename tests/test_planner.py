@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from chaos.algorithms import Algorithms
+from chaos.models import AlgorithmType
+from chaos.order import Order
+from chaos.kernels import DEFAULT_TILE_SIZE
+from chaos.planner import (
+    MATCHING_BACKENDS,
+    MIN_BATCH_PAIRS,
+    MIN_TILE_SIZE,
+    ComputationPlan,
+    Intermediates,
+)
+
+
+@pytest.mark.parametrize("memory_budget", [10**5, 10**6])
+def test_small_memory_budget_downsamples(memory_budget):
+    plan = ComputationPlan([AlgorithmType.APPROXIMATE], memory_budget=memory_budget)
+    choice = plan.select(AlgorithmType.APPROXIMATE, 100_000)
+    assert 0 < choice.length < 100_000
+    assert choice.memory <= memory_budget
+
+
+@pytest.mark.parametrize("memory_budget", [10**5, 10**6])
+def test_small_memory_budget_samples_the_whole_series(memory_budget):
+    plan = ComputationPlan([AlgorithmType.SAMPLE], memory_budget=memory_budget)
+    choice = plan.select(AlgorithmType.SAMPLE, 100_000)
+    assert choice.method == "sampled"
+    assert choice.length == 100_000
+    assert choice.memory <= memory_budget
+
+
+@pytest.mark.parametrize("algorithm", [AlgorithmType.SAMPLE, AlgorithmType.APPROXIMATE])
+def test_small_memory_budget_shrinks_tiles_before_downsampling(algorithm):
+    plan = ComputationPlan([algorithm], memory_budget=10**7)
+    choice = plan.select(algorithm, 100_000)
+    assert choice.method == "exact"
+    assert choice.length == 100_000
+    assert choice.tile_size < DEFAULT_TILE_SIZE
+    assert choice.memory <= 10**7
+
+
+def test_small_memory_budget_fits_short_series():
+    plan = ComputationPlan([AlgorithmType.SAMPLE], memory_budget=10**7)
+    choice = plan.select(AlgorithmType.SAMPLE, 11)
+    assert choice.method == "exact"
+    assert choice.length == 11
+
+
+def test_small_memory_budget_report_keeps_the_whole_text():
+    text = "".join(np.random.default_rng(0).choice(list("abcdefgh "), 20_000))
+    results = Order().get_stats(
+        text,
+        algorithms=[AlgorithmType.SAMPLE, AlgorithmType.APPROXIMATE],
+        memory_budget=10**6,
+    )
+    assert len(results) == 2
+    for result in results:
+        assert np.isfinite(result.entropy)
+        assert result.method == "exact"
+        assert result.length == len(text)
+
+
+@pytest.mark.parametrize("method", ["exact", "indexed"])
+def test_budgeted_tiles_and_batches_reach_the_kernels(method):
+    # float32 series are not compiled, so brute force runs tile by tile.
+    x = np.random.default_rng(1).normal(size=3000).astype(np.float32)
+    algorithms = Algorithms()
+    r = 0.2 * np.std(x)
+    small = Intermediates(
+        x,
+        algorithms,
+        matching_method=MATCHING_BACKENDS[method],
+        tile_size=MIN_TILE_SIZE,
+        max_pairs=MIN_BATCH_PAIRS,
+    )
+    expected = algorithms.count_neighbors(x, 2, r)
+    for counts, expected_counts in zip(small.get("neighbor_counts"), expected):
+        np.testing.assert_array_equal(counts, expected_counts)
+
+
+def test_small_memory_budget_refuses_when_asked():
+    plan = ComputationPlan(
+        [AlgorithmType.APPROXIMATE], memory_budget=10**6, over_budget="refuse"
+    )
+    with pytest.raises(ValueError):
+        plan.select(AlgorithmType.APPROXIMATE, 100_000)
+
+
+def test_plan_evaluates_like_the_algorithms():
+    x = np.random.default_rng(2).normal(size=800)
+    algorithms = Algorithms()
+    r = 0.2 * np.std(x)
+    expected = {
+        AlgorithmType.SHANNON: algorithms.shannon_entropy(x),
+        AlgorithmType.PERMUTATION: algorithms.permutation_entropy(x),
+        AlgorithmType.SAMPLE: algorithms.sample_entropy(x, 2, r),
+        AlgorithmType.APPROXIMATE: algorithms.approximate_entropy(x, 2, r),
+    }
+    plan = ComputationPlan(list(expected))
+    shared = plan.prepare(x, algorithms)
+    for algorithm, value in expected.items():
+        assert plan.evaluate(algorithm, shared) == pytest.approx(value, rel=1e-12)
@@ -0,0 +1,219 @@
+import numpy as np
+import pytest
+from chaos.algorithms import Algorithms
+from chaos.chaos_encoder import ChaosEncoder
+from chaos.kernels import neighbor_counts, ordinal_pattern_counts, symbol_counts
+from chaos.models import EncodingModel
+from chaos.representations import (
+    MAX_PLANE_KEY_BITS,
+    PackedBits,
+    SparseOneHot,
+    matching_pairs,
+    template_phi,
+)
+
+TEXTS = [
+    "a",
+    "aaaaaaaa",
+    "abba abba",
+    "".join(np.random.default_rng(0).choice(list("abcd"), 300)),
+    "".join(np.random.default_rng(1).choice(list("abcdefghij \n"), 150)),
+]
+
+
+def one_hot(text):
+    encoder = ChaosEncoder()
+    dense = encoder.encode(text, EncodingModel.ONE_HOT)
+    sparse = encoder.encode(text, EncodingModel.ONE_HOT, dense=False)
+    return dense, sparse
+
+
+def test_one_hot_is_dense_by_default():
+    dense, sparse = one_hot("hello world")
+    assert isinstance(dense, np.ndarray)
+    assert isinstance(sparse, SparseOneHot)
+
+
+@pytest.mark.parametrize("text", TEXTS, ids=len)
+def test_sparse_one_hot_toarray(text):
+    dense, sparse = one_hot(text)
+    assert len(sparse) == len(dense)
+    np.testing.assert_array_equal(sparse.toarray(), dense)
+    np.testing.assert_array_equal(np.asarray(sparse), dense)
+
+
+@pytest.mark.parametrize("text", TEXTS, ids=len)
+@pytest.mark.parametrize("length", [0, 1, 7, 64, 1000])
+def test_sparse_one_hot_prefix(text, length):
+    dense, sparse = one_hot(text)
+    rows = min(length, len(dense)) // sparse.alphabet_size
+    prefix = sparse.prefix(length)
+    np.testing.assert_array_equal(
+        prefix.toarray(), dense[: rows * sparse.alphabet_size]
+    )
+
+
+@pytest.mark.parametrize("text", TEXTS, ids=len)
+@pytest.mark.parametrize("ddof", [0, 1])
+def test_sparse_one_hot_std(text, ddof):
+    dense, sparse = one_hot(text)
+    if len(dense) <= ddof:
+        return
+    assert sparse.std(ddof) == pytest.approx(np.std(dense, ddof=ddof), rel=1e-12)
+
+
+@pytest.mark.parametrize("text", TEXTS, ids=len)
+def test_sparse_one_hot_shannon_entropy(text):
+    dense, sparse = one_hot(text)
+    np.testing.assert_array_equal(sparse.symbol_counts(), symbol_counts(dense))
+    algorithms = Algorithms()
+    assert algorithms.shannon_entropy(sparse) == pytest.approx(
+        algorithms.shannon_entropy(dense), rel=1e-12
+    )
+
+
+@pytest.mark.parametrize("text", TEXTS, ids=len)
+@pytest.mark.parametrize("order, delay", [(2, 1), (3, 1), (3, 2), (4, 3), (6, 1)])
+def test_sparse_one_hot_permutation_entropy(text, order, delay):
+    dense, sparse = one_hot(text)
+    np.testing.assert_array_equal(
+        sparse.ordinal_pattern_counts(order, delay),
+        ordinal_pattern_counts(dense, order, delay),
+    )
+    algorithms = Algorithms()
+    assert algorithms.permutation_entropy(sparse, order, delay) == pytest.approx(
+        algorithms.permutation_entropy(dense, order, delay), rel=1e-12
+    )
+
+
+@pytest.mark.parametrize("text", TEXTS[2:], ids=len)
+@pytest.mark.parametrize("m", [1, 2, 3])
+def test_sparse_one_hot_multiplicities(text, m):
+    dense, sparse = one_hot(text)
+    n = len(dense)
+    for dim in (m, m + 1):
+        counts = neighbor_counts(dense, dim, 0.5)[0]
+        multiplicities = sparse.template_multiplicities(dim)
+        assert matching_pairs(multiplicities) == counts[: n - dim].sum()
+        phi = np.mean(np.log((counts + 1) / (n - dim + 1)))
+        assert template_phi(multiplicities) == pytest.approx(phi, rel=1e-12)
+
+
+@pytest.mark.parametrize("text", TEXTS[2:], ids=len)
+@pytest.mark.parametrize("m", [1, 2, 3])
+@pytest.mark.parametrize("r", [0.2, 1.0, 1.5])
+def test_sparse_one_hot_sample_and_approximate_entropy(text, m, r):
+    dense, sparse = one_hot(text)
+    algorithms = Algorithms()
+    assert algorithms.sample_entropy(sparse, m, r) == pytest.approx(
+        algorithms.sample_entropy(dense, m, r, method="brute"), rel=1e-12
+    )
+    assert algorithms.approximate_entropy(sparse, m, r) == pytest.approx(
+        algorithms.approximate_entropy(dense, m, r), rel=1e-12, abs=1e-12
+    )
+
+
+N_BITS = [1, 7, 8, 9, 63, 64, 65, 127, 128, 1003, 1024, 1031]
+
+
+def packed(n_bits, seed=0):
+    # Random bytes, so the bits of the last byte past n_bits are not 0.
+    data = np.random.default_rng(seed).integers(0, 256, (n_bits + 7) // 8)
+    bits = PackedBits(data.astype(np.uint8), n_bits)
+    return bits, np.unpackbits(bits.data)
+
+
+def reference_keys(unpacked, n_bits, offsets):
+    n_windows = max(n_bits - int(offsets[-1]), 0)
+    windows = unpacked[np.arange(n_windows)[:, None] + offsets].astype(np.int64)
+    return np.sum(windows << np.arange(len(offsets)), axis=1)
+
+
+@pytest.mark.parametrize("n_bits", N_BITS)
+@pytest.mark.parametrize("m", range(1, 11))
+@pytest.mark.parametrize("delay", [1, 3])
+def test_packed_iter_window_keys(n_bits, m, delay):
+    bits, unpacked = packed(n_bits)
+    offsets = np.arange(m, dtype=np.int64) * delay
+    expected = np.sort(reference_keys(unpacked, n_bits, offsets))
+    for chunk_size in (3, 1 << 20):
+        chunks = list(bits.iter_window_keys(offsets, chunk_size))
+        keys = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+        np.testing.assert_array_equal(np.sort(keys.astype(np.int64)), expected)
+
+
+@pytest.mark.parametrize("n_bits", N_BITS)
+@pytest.mark.parametrize(
+    "offsets", [np.array([0]), np.array([0, 3, 5, 7, 8, 9, 17, 70])]
+)
+def test_packed_planes(n_bits, offsets):
+    bits, unpacked = packed(n_bits)
+    n_words = (n_bits + 63) // 64
+    padded = np.zeros(64 * n_words + int(offsets[-1]) + 64, dtype=np.uint8)
+    padded[: len(unpacked)] = unpacked
+    for start, stop in [(0, n_words), (n_words // 2, n_words)]:
+        positions = 64 * start + np.arange(64 * (stop - start))
+        for plane, offset in zip(bits.planes(offsets, start, stop), offsets):
+            expected = np.packbits(padded[positions + offset]).view(">u8")
+            np.testing.assert_array_equal(plane, expected)
+
+
+# key_counts() counts windows longer than MAX_PLANE_KEY_BITS from their keys.
+@pytest.mark.parametrize("n_bits", N_BITS)
+@pytest.mark.parametrize("m", range(1, MAX_PLANE_KEY_BITS + 3))
+@pytest.mark.parametrize("delay", [1, 3])
+def test_packed_plane_key_counts(n_bits, m, delay):
+    bits, unpacked = packed(n_bits)
+    offsets = np.arange(m, dtype=np.int64) * delay
+    expected = np.bincount(
+        reference_keys(unpacked, n_bits, offsets), minlength=1 << len(offsets)
+    )
+    for chunk_size in (1, 1 << 16):
+        np.testing.assert_array_equal(
+            bits.plane_key_counts(offsets, chunk_size), expected
+        )
+
+
+@pytest.mark.parametrize("n_bits", N_BITS)
+@pytest.mark.parametrize("m", range(1, 11))
+@pytest.mark.parametrize("delay", [1, 3])
+def test_packed_key_counts(n_bits, m, delay):
+    bits, unpacked = packed(n_bits)
+    offsets = np.arange(m, dtype=np.int64) * delay
+    expected = np.unique(reference_keys(unpacked, n_bits, offsets), return_counts=True)
+    keys, counts = bits.key_counts(offsets)
+    np.testing.assert_array_equal(keys, expected[0])
+    np.testing.assert_array_equal(counts, expected[1])
+
+
+@pytest.mark.parametrize("n_bits", N_BITS)
+@pytest.mark.parametrize("m", range(1, 11))
+def test_packed_template_multiplicities(n_bits, m):
+    bits, unpacked = packed(n_bits)
+    multiplicities = bits.template_multiplicities(m)
+    keys = reference_keys(unpacked, n_bits, np.arange(m))
+    _, counts = np.unique(keys, return_counts=True)
+    np.testing.assert_array_equal(multiplicities[0], counts)
+    if len(keys) > 0:
+        assert multiplicities[1] == np.count_nonzero(keys == keys[-1])
+    assert multiplicities[2] == len(keys)
+
+
+@pytest.mark.parametrize("n_bits", N_BITS)
+@pytest.mark.parametrize("order, delay", [(2, 1), (3, 1), (3, 4), (5, 2), (7, 1)])
+def test_packed_ordinal_pattern_counts(n_bits, order, delay):
+    bits, unpacked = packed(n_bits)
+    dense = unpacked[:n_bits].astype(np.int8)
+    np.testing.assert_array_equal(
+        bits.ordinal_pattern_counts(order, delay),
+        ordinal_pattern_counts(dense, order, delay),
+    )
+
+
+@pytest.mark.parametrize("n_bits", N_BITS)
+def test_packed_ones_and_prefix(n_bits):
+    bits, unpacked = packed(n_bits)
+    assert bits.ones() == np.count_nonzero(unpacked[:n_bits])
+    np.testing.assert_array_equal(bits.toarray(), unpacked[:n_bits])
+    for length in (0, 1, n_bits // 2, n_bits - 1):
+        np.testing.assert_array_equal(bits.prefix(length).toarray(), unpacked[:length])
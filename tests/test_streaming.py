@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from chaos.algorithms import Algorithms
+from chaos.streaming import MAX_HISTOGRAM_SYMBOLS, StreamingEntropy
+
+CHUNKED_STREAMS = [
+    [[1, 2, 2], [-1, 1]],
+    [[1, 2], [1, 1 << 30]],
+    [[1, 2, 2], [1.0, 2.0]],
+    [[0, 3, MAX_HISTOGRAM_SYMBOLS], [3, 0.5, -2.0], [MAX_HISTOGRAM_SYMBOLS, 7]],
+    [np.arange(100) % 7, np.arange(50) % 11 - 3],
+]
+
+
+@pytest.mark.parametrize("chunks", CHUNKED_STREAMS)
+def test_chunked_entropy_matches_whole_stream(chunks):
+    estimator = StreamingEntropy()
+    for chunk in chunks:
+        estimator.update(chunk)
+
+    expected = Algorithms().shannon_entropy(np.concatenate(chunks))
+    assert estimator.entropy() == pytest.approx(expected)
+    assert estimator.total == sum(len(chunk) for chunk in chunks)
+
+
+@pytest.mark.parametrize("chunks", CHUNKED_STREAMS)
+def test_merged_entropy_matches_whole_stream(chunks):
+    merged = StreamingEntropy()
+    for chunk in chunks:
+        merged = merged.merge(StreamingEntropy().update(chunk))
+
+    expected = Algorithms().shannon_entropy(np.concatenate(chunks))
+    assert merged.entropy() == pytest.approx(expected)